@@ -0,0 +1,62 @@
+"""Compare loading many compressed datasets in one process and with `open_h5_parallel`.
+
+Usage:
+    python benchmarks/parallel_load.py [n_keys] [mib_per_key] [workers]
+
+The datasets are gzip compressed, so most of the load time is spent decompressing,
+which is the case where several processes can help. With a single CPU, or with small
+uncompressed datasets, the cost of spawning the processes makes the parallel load slower.
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+import h5py
+import numpy as np
+
+from dh5.dh5_class import h5py_utils
+
+
+def make_file(filepath: str, n_keys: int, mib_per_key: float):
+    size = int(mib_per_key * 1024 * 1024 / 8)
+    rng = np.random.default_rng(0)
+    with h5py.File(filepath, "w") as file:
+        for i in range(n_keys):
+            # Rounded values, so that gzip has something to compress
+            data = np.round(rng.random(size), 2)
+            file.create_dataset(f"a{i}", data=data, compression="gzip", chunks=True)
+
+
+def best_time(func, repeat: int = 3) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    n_keys = int(sys.argv[1]) if len(sys.argv) > 1 else 16
+    mib_per_key = float(sys.argv[2]) if len(sys.argv) > 2 else 16
+    workers = int(sys.argv[3]) if len(sys.argv) > 3 else (os.cpu_count() or 1)
+
+    with tempfile.TemporaryDirectory() as directory:
+        filepath = os.path.join(directory, "data.h5")
+        make_file(filepath, n_keys, mib_per_key)
+        keys = {f"a{i}" for i in range(n_keys)}
+
+        serial = best_time(lambda: h5py_utils.open_h5(filepath, keys))
+        parallel = best_time(
+            lambda: h5py_utils.open_h5_parallel(filepath, keys, workers=workers)
+        )
+
+    print(f"{n_keys} keys of {mib_per_key} MiB, {workers} workers")
+    print(f"open_h5:          {serial:.3f} s")
+    print(f"open_h5_parallel: {parallel:.3f} s ({serial / parallel:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -17,6 +17,7 @@ def load(
     *,
     filepath: _t.Optional[_t.Union[str, "Path"]] = None,
     save_on_edit: bool = False,
+    read_only: _t.Optional[_t.Union[bool, _t.Set[str]]] = None,
     overwrite: _t.Optional[bool] = None,
     data: _t.Optional[dict] = None,
     open_on_init: _t.Optional[bool] = None,
@@ -30,6 +31,7 @@ def load(
         filepath (str|Path, optional): filepath to load. Defaults to None.
         save_on_edit (bool, optional): Save data as soon as you changed it.
             Defaults to False. And data should be saved using `save()` method.
+        read_only (bool|set[str], optional): opens file in read_only mode. See `DH5`.
         overwrite: If file exists, overwrite it. Defaults to raise error is file exist.
         data (Optional[dict], optional):
             Data to load. If data provided, file . Defaults to None.
@@ -41,6 +43,7 @@ def load(
         mode=mode,
         filepath=filepath,
         save_on_edit=save_on_edit,
+        read_only=read_only,
         data=data,
         open_on_init=open_on_init,
         overwrite=overwrite,
@@ -48,11 +51,24 @@ def load(
     )
 
 
+def _shallow_structure_copy(data: dict) -> dict:
+    """Copy all nested dicts, but keep references to every other value (arrays, scalars...)."""
+    return {
+        key: _shallow_structure_copy(value) if isinstance(value, dict) else value
+        for key, value in data.items()
+    }
+
+
 def save(
     data: dict,
     filepath: str,
     mode: _t.Literal["w", "a"] = "w",
     overwrite: _t.Optional[bool] = None,
+    *,
+    deep: bool = False,
+    save_on_edit: bool = False,
+    read_only: _t.Optional[_t.Union[bool, _t.Set[str]]] = None,
+    open_on_init: _t.Optional[bool] = None,
     **kwds,
 ):
     """Save data to H5 file.
@@ -60,12 +76,28 @@ def save(
     Args:
         filepath (str): The path to the H5 file.
         data (dict): The data to be saved.
+        mode ("w"|"a", optional): Mode used to open the file. Defaults to "w".
+        overwrite (bool, optional): If file exists, overwrite it. See `DH5`.
+        save_on_edit (bool, optional): Save data as soon as you changed it. Defaults to False.
+        read_only (bool|set[str], optional): Keys that cannot be modified. See `DH5`.
+        open_on_init (bool, optional): See `DH5`.
+        deep (bool, optional): If True, the data is deep copied before being saved.
+            By default only the dict structure is copied and the values (e.g. np.ndarray)
+            are shared with the returned DH5 object. Defaults to False.
         **kwds: Additional keyword arguments to be passed to the DH5 constructor.
 
     Returns:
         DH5: DH5 object with data.
     """
+    data = _deepcopy(data) if deep else _shallow_structure_copy(data)
     dh5 = DH5(
-        data=_deepcopy(data), **kwds, filepath=filepath, overwrite=overwrite, mode=mode
+        data=data,
+        filepath=filepath,
+        mode=mode,
+        save_on_edit=save_on_edit,
+        read_only=read_only,
+        overwrite=overwrite,
+        open_on_init=open_on_init,
+        **kwds,
     )
     return dh5.save(filepath=filepath)
@@ -77,6 +77,25 @@ def transform_to_possible_formats(data: DICT_OR_LIST_LIKE) -> DICT_OR_LIST_LIKE:
     return data
 
 
+_NOT_TRANSFORMED_TYPES = frozenset(
+    (int, float, complex, bool, str, bytes, type(None), np.ndarray)
+)
+
+
+def transform_dict_to_possible_formats(data: dict) -> dict:
+    """Apply `transform_to_possible_formats` to every value of a dict.
+
+    Values of simple types (numbers, str, np.ndarray...) are never transformed,
+    so they are kept as is without calling `transform_to_possible_formats`.
+    """
+    return {
+        key: value
+        if type(value) in _NOT_TRANSFORMED_TYPES
+        else transform_to_possible_formats(value)
+        for key, value in data.items()
+    }
+
+
 def transform_on_open(value):
     """Transform data during opening of h5 file."""
     if isinstance(value, bytes):
@@ -1,13 +1,28 @@
 """Output the structure of a dictionary in a pretty way."""
 
 import json
+import re
+from functools import lru_cache
+from itertools import islice
+from math import fabs
 from typing import Dict, Optional
 
 import numpy as np
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+_LEADING_SPACES = re.compile(r"^( +)", re.MULTILINE)
+# Every key of the indented json starts a new line
+_JSON_KEY = re.compile(r'^( *)"((?:[^"\\\n]|\\.)*)":', re.MULTILINE)
+
 
 def output_dict_structure(
-    data: dict, additional_info: Optional[Dict[str, str]] = None
+    data: dict,
+    additional_info: Optional[Dict[str, str]] = None,
+    max_items: Optional[int] = None,
 ) -> str:
     """Convert a dictionary into a JSON-like string representation of its structure.
 
@@ -17,70 +32,200 @@ def output_dict_structure(
             Each key-value pair in the additional_info dictionary will be appended to the corresponding key in the
             string representation. The key will be enclosed in double quotes and the value will be appended without
             quotes.
+        max_items (Optional[int]): Maximum number of top level keys to describe. The number of
+            skipped keys is written at the end. Defaults to None, i.e. all keys are described.
 
     Returns:
         str: The JSON-like string representation of the dictionary structure.
     """
-    dict_str = dict_to_json_format_str(get_dict_structure(data))
-    if additional_info:
-        for key, value in additional_info.items():
-            dict_str = dict_str.replace(f'"{key}":', f'"{key}"{value}:')
-    return dict_str
+    skipped = ""
+    if max_items is not None and len(data) > max_items:
+        skipped = f"\n... and {len(data) - max_items} more keys"
+        data = dict(islice(data.items(), max_items))
+
+    structure = get_dict_structure(data, sort_keys=True)
+    dict_str = _structure_to_json_str(structure) + skipped
+    if not additional_info:
+        return dict_str
+    info = {str(key): value for key, value in additional_info.items()}
+
+    def add_info(match: "re.Match") -> str:
+        value = info.get(match.group(2))
+        if value is None:
+            return match.group(0)
+        return f'{match.group(1)}"{match.group(2)}"{value}:'
+
+    return _JSON_KEY.sub(add_info, dict_str)
 
 
-def dict_to_json_format_str(data: dict) -> str:
+def dict_to_json_format_str(data: dict, sort_keys: bool = True) -> str:
     """Convert a dictionary to a JSON formatted string.
 
     Args:
         data (dict): The dictionary to be converted.
+        sort_keys (bool, optional): Sort the keys of every (nested) dictionary.
+            Put to False if the dictionary is already in the desired order. Defaults to True.
 
     Returns:
         str: The JSON formatted string representation of the dictionary.
     """
-    return json.dumps(data, sort_keys=True, indent=4)
+    return json.dumps(data, sort_keys=sort_keys, indent=4)
+
+
+def _structure_to_json_str(structure: dict) -> str:
+    """Same as `dict_to_json_format_str` for the output of `get_dict_structure`.
+
+    The structure is expected to be already sorted (see `get_dict_structure(sort_keys=True)`).
+    It only contains strings and dicts, for which `orjson` (if installed) gives the same
+    output as `json`, so it's used as the faster encoder.
+    """
+    if orjson is not None:
+        try:
+            dict_str = orjson.dumps(structure, option=orjson.OPT_INDENT_2).decode()
+        except TypeError:
+            dict_str = None
+        # json escapes non-ascii characters, so fall back to it to keep the same output
+        if dict_str is not None and dict_str.isascii():
+            return _LEADING_SPACES.sub(lambda m: m.group(1) * 2, dict_str)
+    return dict_to_json_format_str(structure, sort_keys=False)
+
+
+@lru_cache(maxsize=1024)
+def _shape_label(tname: str, shape: tuple) -> str:
+    """Return the description of an array-like value. Cached as shapes often repeat."""
+    return f"shape: {shape} (type: {tname})"
+
+
+def _fmt_ndarray(v) -> str:
+    return _shape_label(type(v).__name__, v.shape)
+
+
+def _fmt_list(v) -> str:
+    return _shape_label(type(v).__name__, np.shape(v))
+
+
+def _fmt_int(v) -> str:
+    return f"{v:.0f} (type : {type(v).__name__})"
 
 
-def get_dict_structure(data: dict, level: int = 3) -> dict:
-    """Recursively analyzes the structure of a dictionary.
+_FIXED_POINT_MIN, _FIXED_POINT_MAX = 0.1, 100.0
+
+
+def _fmt_float(v) -> str:
+    str_value = f"{v:.3f}" if _FIXED_POINT_MIN <= fabs(v) <= _FIXED_POINT_MAX else f"{v:.3e}"
+    return f"{str_value} (type : {type(v).__name__})"
+
+
+def _fmt_complex(v) -> str:
+    str_value = f"{v:.3f}" if _FIXED_POINT_MIN <= abs(v) <= _FIXED_POINT_MAX else f"{v:.3e}"
+    return f"{str_value} (type : {type(v).__name__})"
+
+
+def _fmt_other(v) -> str:
+    return f"variable of type {type(v).__name__}"
+
+
+_VAR_DICT = "variable of type dict"
+_MAX_EXPANDED_DICT_SIZE = 5
+
+_INT_TYPES = (int, np.integer)
+_FLOAT_TYPES = (float, np.floating)
+_COMPLEX_TYPES = (complex, np.complexfloating)
+
+_TYPE_DISPATCH = {
+    np.ndarray: _fmt_ndarray,
+    list: _fmt_list,
+    bool: _fmt_int,
+    int: _fmt_int,
+    np.int64: _fmt_int,
+    np.int32: _fmt_int,
+    float: _fmt_float,
+    np.float64: _fmt_float,
+    np.float32: _fmt_float,
+    complex: _fmt_complex,
+    np.complex128: _fmt_complex,
+    str: _fmt_other,
+    type(None): _fmt_other,
+}
+
+
+def _get_leaf_handler(v):
+    """Return the formatter for a non-dict value.
+
+    Exact types are resolved with a single dict lookup, subclasses and other
+    numpy scalars fall back to `isinstance` checks.
+    """
+    handler = _TYPE_DISPATCH.get(type(v))
+    if handler is not None:
+        return handler
+    if isinstance(v, np.ndarray):
+        return _fmt_ndarray
+    if isinstance(v, list):
+        return _fmt_list
+    if isinstance(v, _INT_TYPES):
+        return _fmt_int
+    if isinstance(v, _FLOAT_TYPES):
+        return _fmt_float
+    if isinstance(v, _COMPLEX_TYPES):
+        return _fmt_complex
+    return _fmt_other
+
+
+def _leaf_only_structure(data: dict) -> dict:
+    """Structure of a dictionary without exploring nested dictionaries."""
+    return {
+        k: _VAR_DICT if isinstance(v, dict) else _get_leaf_handler(v)(v)
+        for k, v in data.items()
+    }
+
+
+def get_dict_structure(data: dict, level: int = 3, sort_keys: bool = False) -> dict:
+    """Analyze the structure of a dictionary.
     Returns a dictionary containing information about the types and shapes of the values.
 
+    Nested dictionaries are explored up to `level` deep. A nested dictionary that is empty
+    or has more than 5 keys is described as "variable of type dict".
+
     Args:
         data (dict): The dictionary to analyze.
         level (int, optional): The maximum depth to analyze the dictionary. Defaults to 3.
+        sort_keys (bool, optional): Sort the keys at every level of the structure,
+            instead of keeping the order of `data`. Defaults to False.
 
     Returns:
         dict: A dictionary containing information about the structure of the input dictionary.
     """
     structure = {}
-
-    for k, v in data.items():
-        if isinstance(v, dict):
-            if level:
-                internal_structure = (
-                    get_dict_structure(v, level=level - 1) if len(v) else "empty dict"
-                )
-                structure[k] = (
-                    "variable of type dict"
-                    if len(internal_structure) > 5
-                    else internal_structure
-                )
+    stack = [(data, structure, level)]
+
+    while stack:
+        current, out, lvl = stack.pop()
+        if sort_keys:
+            current = dict(sorted(current.items()))
+        if all(type(v) is np.ndarray for v in current.values()):
+            # Common case of a flat dict of arrays: no dispatch is needed
+            out.update(
+                {k: _shape_label("ndarray", v.shape) for k, v in current.items()}
+            )
+            continue
+        if not lvl:
+            out.update(_leaf_only_structure(current))
+            continue
+        for k, v in current.items():
+            if isinstance(v, dict):
+                if v and len(v) <= _MAX_EXPANDED_DICT_SIZE:
+                    sub_structure = {}
+                    out[k] = sub_structure
+                    stack.append((v, sub_structure, lvl - 1))
+                else:
+                    out[k] = _VAR_DICT
             else:
-                structure[k] = "variable of type dict"
-
-        elif isinstance(v, (np.ndarray, list)):
-            structure[k] = f"shape: {np.shape(v)} (type: {type(v).__name__})"
-        elif isinstance(v, (int, np.int_)):  # type: ignore
-            structure[k] = f"{v:.0f} (type : {type(v).__name__})"
-        elif isinstance(v, (float, np.floating, complex, np.complex128)):  # type: ignore
-            str_value = f"{v:.3f}" if 0.1 <= abs(v) <= 100.0 else f"{v:.3e}"
-            structure[k] = f"{str_value} (type : {type(v).__name__})"
-        else:
-            structure[k] = f"variable of type {type(v).__name__}"
+                out[k] = _get_leaf_handler(v)(v)
     return structure
 
 
 def get_keys_structure(data) -> dict:
-    """Recursively traverses a dictionary and returns its structure with keys and None values.
+    """Traverse a dictionary and returns its structure with keys and None values.
 
     Args:
         data (dict): The dictionary to analyze.
@@ -90,10 +235,15 @@ def get_keys_structure(data) -> dict:
 
     """
     structure = {}
-    for k, v in data.items():
-        if isinstance(v, dict):
-            structure[k] = get_keys_structure(v)
-        else:
-            structure[k] = None
+    stack = [(data, structure)]
+    while stack:
+        current, out = stack.pop()
+        for k, v in current.items():
+            if isinstance(v, dict):
+                sub_structure = {}
+                out[k] = sub_structure
+                stack.append((v, sub_structure))
+            else:
+                out[k] = None
 
     return structure
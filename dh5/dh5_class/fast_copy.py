@@ -0,0 +1,35 @@
+"""Deep copy specialized for the data stored inside DH5."""
+
+from copy import deepcopy
+from typing import Any
+
+import numpy as np
+
+IMMUTABLE_TYPES = (str, bytes, int, float, complex, type(None), np.generic)
+
+
+def fast_deepcopy(obj: Any) -> Any:
+    """Deep copy dicts, lists, tuples and arrays without the generic `copy` machinery.
+
+    Immutable values are returned as is. Any other object is copied with `copy.deepcopy`.
+    Unlike `copy.deepcopy`, shared references inside containers are not preserved, so
+    an object that appears twice is copied twice. Self-referencing containers are not supported.
+
+    Examples:
+        >>> data = {"a": [1, 2], "b": np.zeros(3)}
+        >>> data_copy = fast_deepcopy(data)
+        >>> data_copy["a"] is data["a"]
+        False
+    """
+    obj_type = type(obj)
+    if obj_type is dict:
+        return {key: fast_deepcopy(value) for key, value in obj.items()}
+    if obj_type is list:
+        return [fast_deepcopy(value) for value in obj]
+    if obj_type is tuple:
+        return tuple(fast_deepcopy(value) for value in obj)
+    if obj_type is np.ndarray:
+        return obj.copy()
+    if isinstance(obj, IMMUTABLE_TYPES):
+        return obj
+    return deepcopy(obj)
@@ -1,11 +1,21 @@
 """Utils to save and load h5 files."""
 
+import hashlib
+import multiprocessing
 import os
+import zlib
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import product, repeat
 from typing import Literal, Optional, Set, Union
 
 import h5py
 import numpy as np
 
+try:
+    import xxhash
+except ImportError:  # pragma: no cover
+    xxhash = None
+
 from ..errors import FileLockedError
 from ..types import ClassWithAsdict
 from .data_transformation import transform_not_dict_on_save, transform_on_open
@@ -49,6 +59,33 @@ class LockFile:
             os.remove(self.lock_filename)
 
 
+# -------------- File fingerprint ----------------
+
+FINGERPRINT_BLOCK_SIZE = 64 * 1024
+
+
+def file_content_hash(filename: str) -> int:
+    """Return a hash of the first and the last 64 KiB of a file.
+
+    It's a cheap way to detect that the content of a file changed even if
+    its modification time did not. `xxhash` is used if installed, otherwise `blake2b`.
+
+    Args:
+        filename (str): Full filepath to the file.
+
+    Returns:
+        int: The hash of the content.
+    """
+    with open(filename, "rb") as file:
+        data = file.read(FINGERPRINT_BLOCK_SIZE)
+        if len(data) == FINGERPRINT_BLOCK_SIZE:
+            file.seek(-FINGERPRINT_BLOCK_SIZE, os.SEEK_END)
+            data += file.read(FINGERPRINT_BLOCK_SIZE)
+    if xxhash is not None:
+        return xxhash.xxh64(data).intdigest()
+    return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), "little")  # pragma: no cover
+
+
 # -------------- Open file ----------------
 
 
@@ -99,13 +136,138 @@ def open_h5(
         dict: The loaded data. Each value was transform using transform_on_open function.
     """
     with h5py.File(fullpath, "r") as file:
-        if key_prefix is None:
-            return open_h5_group(file, key=key)
-        return open_h5_group(file[key_prefix], key=key)  # type: ignore
+        return open_h5_file(file, key=key, key_prefix=key_prefix)
+
+
+def open_h5_file(
+    file: h5py.File,
+    key: Optional[Union[str, Set[str]]] = None,
+    key_prefix: Optional[str] = None,
+) -> dict:
+    """Same as `open_h5`, but reads from an already opened file."""
+    if key_prefix is None:
+        return open_h5_group(file, key=key)
+    return open_h5_group(file[key_prefix], key=key)  # type: ignore
+
+
+# Raw data chunk cache of a file kept open for reading
+READ_CHUNK_CACHE_NBYTES = 64 * 1024 * 1024
+READ_CHUNK_CACHE_NSLOTS = 1_000_003
+
+
+def open_read_handle(fullpath: str) -> h5py.File:
+    """Open the h5 file for reading with a large chunk cache.
+
+    The caller is responsible for closing it. It's meant to be kept open, so
+    the decompressed chunks are reused between reads.
+    """
+    return h5py.File(
+        fullpath,
+        "r",
+        rdcc_nbytes=READ_CHUNK_CACHE_NBYTES,
+        rdcc_nslots=READ_CHUNK_CACHE_NSLOTS,
+    )
+
+
+def open_h5_parallel(
+    fullpath: str,
+    keys: Set[str],
+    key_prefix: Optional[str] = None,
+    workers: int = 2,
+) -> dict:
+    """Open h5 file reading the keys in several processes.
+
+    HDF5 library serializes all reads inside one process, so threads cannot speed them up.
+    Here keys are split into `workers` disjoint shards and each process opens the file
+    independently to read its shard. The processes are spawned, as forking a process
+    where HDF5 is already initialized is not safe. Starting them takes some time, so it's
+    only worth it for large reads, e.g. of compressed datasets.
+
+    Args:
+        fullpath (str): Full filepath to the file.
+        keys (set[str]): Keys to load.
+        key_prefix (str, optional): Key prefix to put before each key. Defaults to None.
+        workers (int, optional): Number of processes. Defaults to 2.
+
+    Returns:
+        dict: The loaded data. Each value was transform using transform_on_open function.
+    """
+    ordered_keys = sorted(keys)
+    shards = [set(ordered_keys[i::workers]) for i in range(workers)]
+    data = {}
+    with ProcessPoolExecutor(
+        max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+    ) as executor:
+        for part in executor.map(open_h5, repeat(fullpath), shards, repeat(key_prefix)):
+            data.update(part)
+    return data
 
 
 # -------------- Save file ----------------
 
+# Arrays compressed with gzip that are larger than this are compressed by chunk in
+# several threads and written directly, bypassing the HDF5 filter pipeline
+DIRECT_CHUNK_MIN_NBYTES = 16 * 1024 * 1024
+DIRECT_CHUNK_NBYTES = 1024 * 1024
+GZIP_LEVEL = 4  # same as the h5py default
+
+
+def _can_write_direct_chunks(data, compression) -> bool:
+    return (
+        compression == "gzip"
+        and isinstance(data, np.ndarray)
+        and data.ndim > 0
+        and data.size > 0
+        and data.dtype.kind in "biufc"
+        and data.nbytes >= DIRECT_CHUNK_MIN_NBYTES
+    )
+
+
+def _direct_chunk_shape(shape: tuple, itemsize: int) -> tuple:
+    """Return a chunk shape of at most `DIRECT_CHUNK_NBYTES` (unless it's a single item).
+
+    The largest axis is halved until the chunk is small enough, so wide arrays are split
+    along every axis and not only along the first one.
+    """
+    chunk = list(shape)
+    while int(np.prod(chunk)) * itemsize > DIRECT_CHUNK_NBYTES:
+        axis = int(np.argmax(chunk))
+        if chunk[axis] == 1:
+            break
+        chunk[axis] = (chunk[axis] + 1) // 2
+    return tuple(chunk)
+
+
+def _create_dataset_direct_chunks(
+    group: Union[h5py.File, h5py.Group], key: str, data: np.ndarray
+):
+    """Create a gzip compressed dataset writing precompressed chunks directly.
+
+    Chunks are of about `DIRECT_CHUNK_NBYTES` (see `_direct_chunk_shape`). They are
+    compressed with zlib (that releases the GIL) in a thread pool, so the compression
+    uses several cores, and written with `write_direct_chunk`.
+    """
+    chunk_shape = _direct_chunk_shape(data.shape, data.dtype.itemsize)
+    dataset = group.create_dataset(
+        key, shape=data.shape, dtype=data.dtype, chunks=chunk_shape, compression="gzip"
+    )
+
+    def compress(offset: tuple) -> bytes:
+        chunk = data[tuple(slice(o, o + n) for o, n in zip(offset, chunk_shape))]
+        if chunk.shape != chunk_shape:
+            # HDF5 stores edge chunks at full size
+            padded = np.zeros(chunk_shape, dtype=data.dtype)
+            padded[tuple(slice(0, n) for n in chunk.shape)] = chunk
+            chunk = padded
+        return zlib.compress(np.ascontiguousarray(chunk).tobytes(), GZIP_LEVEL)
+
+    offsets = list(
+        product(*(range(0, size, n) for size, n in zip(data.shape, chunk_shape)))
+    )
+    with ThreadPoolExecutor() as executor:
+        for offset, chunk_bytes in zip(offsets, executor.map(compress, offsets)):
+            dataset.id.write_direct_chunk(offset, chunk_bytes)
+
 
 def save_sub_dict(
     group: Union[h5py.File, h5py.Group],
@@ -137,9 +299,12 @@ def save_sub_dict(
         data = transform_not_dict_on_save(data)  # type: ignore
         if isinstance(data, (np.ndarray, list)):
             use_compression = "gzip" if use_compression is True else use_compression
-            group.create_dataset(
-                key, data=data, compression=use_compression
-            )  # compression="gzip"
+            if _can_write_direct_chunks(data, use_compression):
+                _create_dataset_direct_chunks(group, key, data)  # type: ignore
+            else:
+                group.create_dataset(
+                    key, data=data, compression=use_compression
+                )  # compression="gzip"
         else:
             group.create_dataset(key, data=data)
 
@@ -2,14 +2,31 @@
 
 
 class NotLoaded:
-    """Data that has not been loaded yet."""
+    """Data that has not been loaded yet.
 
-    def __init__(self):
-        """Nothing to do."""
+    Only one instance exists per class, so `NotLoaded() is NOT_LOADED`.
+    """
+
+    __slots__ = ()
+    _instance = None
+
+    _STR = """This key is not loaded. If you see this message,
+                it means that you accessed the key not via DH5 object"""
+    _REPR = """This key is not loaded"""
+
+    def __new__(cls):
+        if cls.__dict__.get("_instance") is None:
+            cls._instance = super().__new__(cls)
+        return cls._instance
+
+    def __bool__(self) -> bool:
+        return False
 
     def __str__(self) -> str:
-        return """This key is not loaded. If you see this message,
-                it means that you accessed the key not via DH5 object"""  # pragma: no cover
+        return self._STR  # pragma: no cover
 
     def __repr__(self) -> str:
-        return """This key is not loaded"""  # pragma: no cover
+        return self._REPR  # pragma: no cover
+
+
+NOT_LOADED = NotLoaded()
@@ -1,18 +1,42 @@
 """DH5 class is a dictionary that is synchronized with .h5 file."""
 
+import inspect
 import logging
 import os
-from copy import deepcopy
-from functools import wraps
+import random
+import threading
+import time
+import weakref
+from functools import lru_cache, wraps
 from pathlib import Path
-from typing import Any, Dict, Iterable, Literal, Optional, Set, TypeVar, Union, overload
+from typing import (
+    Any,
+    Dict,
+    FrozenSet,
+    Iterable,
+    Iterator,
+    Literal,
+    Optional,
+    Set,
+    Tuple,
+    TypeVar,
+    Union,
+    overload,
+)
+
+import h5py
+import numpy as np
 
 from ..errors import ReadOnlyKeyError
 from ..types import DICT_OR_LIST_LIKE
 from . import h5py_utils
-from .data_transformation import transform_to_possible_formats
+from .data_transformation import (
+    transform_dict_to_possible_formats,
+    transform_to_possible_formats,
+)
 from .dict_structure import get_keys_structure, output_dict_structure
-from .internal_classes import NotLoaded
+from .fast_copy import IMMUTABLE_TYPES, fast_deepcopy
+from .internal_classes import NOT_LOADED, NotLoaded
 
 # from ..utils import
 
@@ -20,12 +44,17 @@ from .internal_classes import NotLoaded
 def editing(func):
     """If a function changes the data it should be saved.
     It's a wrapper for such function.
+
+    If no key was changed by the function, nothing is done afterwards.
     """
 
     @wraps(func)
     def run_func_and_clean_precalculated_results(self, *args, **kwargs):
-        self._last_data_saved = False  # pylint: disable=W0212
+        edit_count = self._edit_count  # pylint: disable=W0212
         res = func(self, *args, **kwargs)
+        if edit_count == self._edit_count:  # pylint: disable=W0212
+            return res
+        self._last_data_saved = False  # pylint: disable=W0212
         self._clean_precalculated_results()  # pylint: disable=W0212
         if self._save_on_edit:  # pylint: disable=W0212
             self.save(only_update=True)
@@ -34,6 +63,46 @@ def editing(func):
     return run_func_and_clean_precalculated_results
 
 
+def _freeze(data):
+    """Return a version of data that cannot modify the original one.
+
+    np.ndarray is returned as a non-writeable view, so no data is copied.
+    Dicts are copied with their values frozen, immutable values are returned as is
+    and any other object is deep copied with `fast_deepcopy`.
+    """
+    if isinstance(data, np.ndarray):
+        view = data.view()
+        view.flags.writeable = False
+        return view
+    if isinstance(data, dict):
+        return {key: _freeze(value) for key, value in data.items()}
+    if isinstance(data, IMMUTABLE_TYPES):
+        return data
+    return fast_deepcopy(data)
+
+
+_MISSING = object()
+
+
+@lru_cache(maxsize=256)
+def _value_hooks(cls: type) -> Tuple[bool, bool, bool]:
+    """Return whether the class defines `save`, `__init__filepath__` and `__post__init__`.
+
+    Looked up statically on the class, so it's computed once per type.
+    """
+    return tuple(  # type: ignore
+        inspect.getattr_static(cls, name, _MISSING) is not _MISSING
+        for name in ("save", "__init__filepath__", "__post__init__")
+    )
+
+
+# Maximum number of top level keys described by `DH5.__repr__`
+MAX_REPR_ITEMS = 64
+
+# Delays in seconds between the retries to save a locked file
+_RETRY_BASE_DELAY = 0.05
+_RETRY_MAX_DELAY = 2.0
+
 _T = TypeVar("_T")
 _SELF = TypeVar("_SELF", bound="DH5")
 
@@ -72,16 +141,39 @@ class DH5:
 
     """
 
-    _repr: Optional[str] = None
     _default_attr = ["get", "items", "keys", "pop", "update", "values", "save"]
-    _last_data_saved: bool = False
-    _filepath: Optional[str] = None
+    _repr: Optional[str]
+    _last_data_saved: bool
+    _filepath: Optional[str]
+    _filepath_noext: Optional[str]
+    _filename: Optional[str]
     _read_only: Union[bool, Set[str]]
     _raise_file_locked_error: bool = False
-    _retry_on_file_locked_error: int = 5
-    _last_time_data_checked: float = 0
-    _file_modified_time: float = 0
-    __should_initialized: bool = False
+    _retry_on_file_locked_error: int = 8
+    _last_time_data_checked: float
+    _file_fp: Optional[Tuple[int, int, Optional[int]]]
+    _prefetch_n: int = 0
+    _keys_cache: Optional[FrozenSet[str]]
+    _edit_count: int
+    # Number of processes used to load many keys at once. 0 means no parallel loading
+    _parallel_workers: int = 0
+    _parallel_min_keys: int = 16
+    # Keep the file opened between reads in read-only mode. It holds the HDF5 file lock,
+    # so no other process can write to the file until `close` is called
+    _keep_file_open: bool = False
+    # Write saves in a background thread. Call `flush` to wait for them
+    _background_save: bool = False
+    _pending_writes: Dict[str, dict]
+    _write_lock: Optional[threading.Lock]
+    _writer: Optional[threading.Thread]
+    _write_error: Optional[Exception]
+    # Compression of the saved arrays, see `h5py_utils.save_dict`
+    _use_compression: Optional[Union[Literal[True], str]] = None
+    # Time during which the result of `pull_available` is reused
+    _pull_check_ttl: float = 0.1
+    _pull_check_cache: Optional[Tuple[Optional[Tuple[int, int, Optional[int]]], bool]]
+    _h5_file: Optional[h5py.File]
+    __should_initialized: bool
     __should_not_be_converted__ = True
 
     def __init__(
@@ -137,12 +229,29 @@ class DH5:
         if filepath and not isinstance(filepath, str):
             filepath = str(filepath)
 
+        self._repr = None
+        self._last_data_saved = False
+        self._filepath = None
+        self._filepath_noext = None
+        self._filename = None
+        self._last_time_data_checked = 0
+        self._file_fp = None
+        self._keys_cache = None
+        self._edit_count = 0
+        self._pending_writes = {}
+        self._write_lock = None
+        self._writer = None
+        self._write_error = None
+        self._pull_check_cache = None
+        self._h5_file = None
+        self.__should_initialized = False
+
         self._data: Dict[str, Any] = data or {}
         # transform_to_possible_formats(self._data)
         self._keys: Set[str] = set(self._data.keys())
         self._last_update = set()
         self._save_on_edit = save_on_edit
-        self._classes_should_be_saved_internally = set()
+        self._classes_should_be_saved_internally: Set[str] = set()
         self._key_prefix: Optional[str] = kwds.get("key_prefix")
 
         if read_only is None:
@@ -156,6 +265,9 @@ class DH5:
             open_on_init if open_on_init is not None else (None if self._data else True)
         )
         self._unopened_keys = set()
+        self._pending_loads: Set[str] = set()
+        # key -> (raw value, weak reference to the DH5 returned by `get` for it)
+        self._child_cache: Dict[str, Tuple[Any, "weakref.ref[DH5]"]] = {}
 
         # if keep_up_to_data and read_only is True:
         # raise ValueError("Cannot open file in read-only and keep_up_to_data=True mode")
@@ -163,14 +275,24 @@ class DH5:
 
         self._read_only = read_only
         if filepath is not None:
-            filepath = filepath if filepath.endswith(".h5") else filepath + ".h5"
+            filepath = self._normalize(filepath)
 
             if (overwrite or save_on_edit) and read_only:
                 raise ValueError(
                     """Cannot open file in read_only mode and overwrite it."""
                 )
 
-            if os.path.exists(filepath):
+            if kwds.get("_from_parent"):
+                # The file was already checked when the parent was opened
+                stat = None
+            else:
+                stat = self._stat(filepath)
+                if stat is None and read_only:
+                    raise ValueError(
+                        f"Cannot open file in read_only mode if file {filepath} does not exist"
+                    )
+
+            if stat is not None:
                 if overwrite is None and not read_only:
                     raise FileExistsError(
                         "File with the same name already exists. So you should explicitly "
@@ -184,20 +306,16 @@ class DH5:
 
                 if read_only or (not read_only and not overwrite):
                     if self._open_on_init:
-                        self._load_from_h5(filepath)
+                        self._load_from_h5(filepath, stat=stat)
                     elif self._open_on_init is False:
                         self._keys = h5py_utils.keys_h5(
                             filepath, key_prefix=self._key_prefix
                         )
-                        self._unopened_keys.update(self._keys)
-
-            elif read_only:
-                raise ValueError(
-                    f"Cannot open file in read_only mode if file {filepath} does not exist"
-                )
+                        # copy() allocates the hash table at the right size at once
+                        self._unopened_keys = self._keys.copy()
 
             # if not read_only:
-            self._filepath = filepath
+            self._set_filepath(filepath)
 
     @classmethod
     def open_overwrite(
@@ -243,22 +361,153 @@ class DH5:
             save_on_edit (bool, optional): Whether to save the file automatically when it is edited. Defaults to False.
             **kwargs: Additional keyword arguments to pass to the constructor.
         """
-        self._filepath = filepath
+        self._set_filepath(filepath)
         self._key_prefix = filekey
         self._save_on_edit = save_on_edit
 
     def _load_from_h5(
-        self, filepath: Optional[str] = None, key: Optional[Union[str, Set[str]]] = None
+        self,
+        filepath: Optional[str] = None,
+        key: Optional[Union[str, Set[str]]] = None,
+        stat: Optional[os.stat_result] = None,
+        keep_open: bool = False,
     ) -> Set[str]:
-        """Load data from h5 to self._data."""
-        filepath = filepath or self._filepath
+        """Load data from h5 to self._data.
+
+        `stat` can be provided if the file was already stat'ed, to avoid doing it again.
+        With `keep_open` the file is read through the handle kept open (see `_read_handle`),
+        the caller is then responsible to close it.
+        """
+        filepath = self._normalize(filepath) if filepath else self._filepath
         if filepath is None:
             raise ValueError("Filepath is not specified. So cannot load_h5")
-        filepath = filepath if filepath.endswith(".h5") else filepath + ".h5"
-        data = h5py_utils.open_h5(filepath, key=key, key_prefix=self._key_prefix)
-        self._file_modified_time = os.path.getmtime(filepath)
+        if self._writer is not None:
+            self.flush()
+        if (
+            self._parallel_workers > 0
+            and isinstance(key, set)
+            and len(key) >= self._parallel_min_keys
+        ):
+            data = h5py_utils.open_h5_parallel(
+                filepath,
+                key,
+                key_prefix=self._key_prefix,
+                workers=self._parallel_workers,
+            )
+        elif keep_open or (self._keep_file_open and self._read_only is True):
+            data = h5py_utils.open_h5_file(
+                self._read_handle(filepath), key=key, key_prefix=self._key_prefix
+            )
+        else:
+            data = h5py_utils.open_h5(filepath, key=key, key_prefix=self._key_prefix)
+        self._file_fp = self._file_fingerprint(filepath, stat)
         return self._update(data)
 
+    def _read_handle(self, filepath: str) -> h5py.File:
+        """Return the file kept open for reading, opening it if needed."""
+        file = self._h5_file
+        if file is None or not file.id.valid or file.filename != filepath:
+            self._close_handle()
+            file = self._h5_file = h5py_utils.open_read_handle(filepath)
+        return file
+
+    def close(self) -> None:
+        """Close the file if it was kept open (see `keep_file_open`).
+
+        Waits for the saves queued in background (see `flush`).
+
+        Raises:
+            Exception: The error raised by a failed background save, if any.
+        """
+        self._close_handle()
+        self.flush()
+
+    def _close_handle(self) -> None:
+        if self._h5_file is not None:
+            if self._h5_file.id.valid:
+                self._h5_file.close()
+            self._h5_file = None
+
+    def __enter__(self: _SELF) -> _SELF:
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Wait for the saves queued in background and close the file (see `close`)."""
+        self.close()
+
+    def __del__(self):
+        if getattr(self, "_writer", None) is not None:
+            try:
+                self.flush()
+            except Exception:  # pylint: disable=W0718
+                pass  # already logged by the writer thread
+        if getattr(self, "_h5_file", None) is not None:
+            self._close_handle()
+
+    @staticmethod
+    def _normalize(filepath: str) -> str:
+        """Return the filepath with the '.h5' extension."""
+        return filepath if filepath.endswith(".h5") else filepath + ".h5"
+
+    @staticmethod
+    def _stat(filepath: str) -> Optional[os.stat_result]:
+        """Return os.stat of the file or None if it doesn't exist."""
+        try:
+            return os.stat(filepath)
+        except FileNotFoundError:
+            return None
+
+    @staticmethod
+    def _file_fingerprint(
+        filepath: str, stat: Optional[os.stat_result] = None
+    ) -> Tuple[int, int, Optional[int]]:
+        """Return (modification time in ns, size, content hash) of the file.
+
+        The content hash requires reading the file, so it's left to None here and
+        computed by `pull_available` only when it's needed.
+        """
+        if stat is None:
+            stat = os.stat(filepath)
+        return stat.st_mtime_ns, stat.st_size, None
+
+    def prefetch(self: _SELF, keys: Union[str, Iterable[str]]) -> _SELF:
+        """Mark unopened keys to be loaded together with the next unopened key accessed.
+
+        All pending keys are read with a single opening of the file.
+
+        Args:
+            keys (str | Iterable[str]): key or keys to load on the next access.
+
+        Returns:
+            Self.
+
+        Examples:
+            >>> sd = DH5('somedata.h5', open_on_init=False)
+            >>> sd.prefetch(['a', 'b', 'c'])
+            >>> sd['a']  # loads 'a', 'b' and 'c' at once
+        """
+        if isinstance(keys, str):
+            keys = (keys,)
+        self._pending_loads.update(keys)
+        return self
+
+    def flush_pending_loads(self: _SELF) -> _SELF:
+        """Load all keys marked by `prefetch` with a single opening of the file."""
+        keys = self._pending_loads & self._unopened_keys
+        self._pending_loads = set()
+        if keys:
+            self._load_from_h5(key=keys)
+        return self
+
+    def _load_unopened_key(self, key: str):
+        """Load an unopened key together with pending keys and `_prefetch_n` other unopened keys."""
+        self._pending_loads.add(key)
+        if self._prefetch_n > 0:
+            others = (k for k in self._unopened_keys if k not in self._pending_loads)
+            for _, other in zip(range(self._prefetch_n), others):
+                self._pending_loads.add(other)
+        self.flush_pending_loads()
+
     def load(
         self, filepath: Optional[str] = None, key: Optional[Union[str, Set[str]]] = None
     ):
@@ -266,8 +515,8 @@ class DH5:
         updated_from_other_file = filepath is not None
         updated_key = self._load_from_h5(filepath=filepath, key=key)
         if updated_from_other_file:
-            for key in updated_key:
-                self._keys.add(key)
+            self._keys.update(updated_key)
+            self._keys_changed()
 
         return self
 
@@ -303,8 +552,7 @@ class DH5:
         elif isinstance(keys, str):
             keys = (keys,)
 
-        for key in keys:
-            self._read_only.add(key)
+        self._read_only.update(keys)
 
         self._clean_precalculated_results()
         return self
@@ -342,9 +590,7 @@ class DH5:
             else:
                 if isinstance(remove_keys, str):
                     remove_keys = (remove_keys,)
-                for key in remove_keys:
-                    if key in self._read_only:
-                        self._read_only.remove(key)
+                self._read_only.difference_update(remove_keys)
 
         self._clean_precalculated_results()
         return self
@@ -352,14 +598,29 @@ class DH5:
     def _clean_precalculated_results(self):
         self._repr = None
 
+    def _keys_changed(self):
+        """Must be called every time `_keys` or `_unopened_keys` are modified.
+
+        `_keys` contains all the keys, `_unopened_keys` is the subset of them that
+        are not loaded into `_data` yet.
+        """
+        self._keys_cache = None
+
     def __add_key(self, key):
         self._pre_save()
         self._keys.add(key)
+        self._keys_changed()
+        self._child_cache.pop(key, None)
         self._last_update.add(key)
+        self._edit_count += 1
 
     def __del_key(self, key):
         self._keys.remove(key)
+        self._unopened_keys.discard(key)
+        self._keys_changed()
+        self._child_cache.pop(key, None)
         self._last_update.add(key)
+        self._edit_count += 1
 
     def __check_read_only_true(self, key):
         """Return true if data with this key is only available for read.
@@ -395,14 +656,15 @@ class DH5:
         if __m is not None:
             kwds.update(__m)
 
+        read_only = self._read_only
         for key in kwds:  # pylint: disable=C0206
-            if self.__check_read_only_true(key):
+            # same as self.__check_read_only_true(key), but without a call per key
+            if read_only and (read_only is True or key in read_only):
                 raise ReadOnlyKeyError(key)
             self.__add_key(key)
-            kwds[key] = transform_to_possible_formats(kwds[key])
 
         # self.pull(auto=True)
-        self._data.update(**kwds)
+        self._data.update(transform_dict_to_possible_formats(kwds))
         return self
 
     def _update(self, __m: Optional[dict] = None, **kwds: Any):
@@ -413,9 +675,10 @@ class DH5:
         if __m is not None:
             kwds.update(__m)
 
-        for key in kwds:
-            self._keys.add(key)
-            self._unopened_keys.discard(key)
+        # `set |= dict_keys` would build a new set instead of updating it in place
+        self._keys.update(kwds)
+        self._unopened_keys.difference_update(kwds)
+        self._keys_changed()
 
         self._data.update(kwds)
 
@@ -440,11 +703,12 @@ class DH5:
         """
         if self.__check_read_only_true(key):
             raise ReadOnlyKeyError(key, action="pop")
+        loaded = key not in self._unopened_keys
         self.__del_key(key)
         # self.pull(auto=True)
-        if key not in self._unopened_keys:
+        if loaded:
             return self._data.pop(key)
-        return NotLoaded()
+        return NOT_LOADED
 
     @editing
     def remove(self: _SELF, key: str) -> _SELF:
@@ -527,15 +791,38 @@ class DH5:
             'unknown' # Returns 'unknown' since 'gender' key doesn't exist
 
         """
+        read_only = self.__check_read_only_true(key)
+        cached = self._child_cache.get(key)
+        if cached is not None:
+            raw, child_ref = cached
+            child = child_ref()
+            if (
+                child is not None
+                and self._data.get(key) is raw
+                and child._read_only == read_only  # pylint: disable=W0212
+            ):
+                # `raw` can be edited in place through the parent, e.g. sd["dict"]["d"] = 4
+                if child._keys != raw.keys():  # pylint: disable=W0212
+                    child._keys = set(raw)  # pylint: disable=W0212
+                    child._keys_changed()  # pylint: disable=W0212
+                child._clean_precalculated_results()  # pylint: disable=W0212
+                return child
+
         data = self.__get_data__(key, default)
         if isinstance(data, dict) and data:
-            return DH5(
+            child = DH5(
                 filepath=self._filepath,
                 data=data,
                 overwrite=False,
                 key_prefix=key,
-                read_only=self.__check_read_only_true(key),
+                read_only=read_only,
+                _from_parent=True,
             )
+            raw = self._data.get(key)
+            # Read-only children hold a copy of `raw`, which cannot follow its changes
+            if raw is not None and child._data is raw:  # pylint: disable=W0212
+                self._child_cache[key] = (raw, weakref.ref(child))
+            return child
         return data
 
     def __getitem__(self, __key: Union[str, tuple]) -> Any:
@@ -555,9 +842,10 @@ class DH5:
         """
         if isinstance(__key, tuple):
             if len(__key) > 1:
-                return self.__getitem__(__key[0]).__getitem__(
-                    __key[1:] if len(__key) > 2 else __key[1]
+                container, last_key = self._walk(
+                    self.__get_data_or_raise__(__key[0]), __key[1:]
                 )
+                return container[last_key]
             if len(__key) == 1:
                 return self.__getitem__(__key[0])
             raise ValueError(
@@ -565,6 +853,20 @@ class DH5:
             )
         return self.__get_data_or_raise__(__key)
 
+    @staticmethod
+    def _walk(data: Any, keys: tuple) -> Tuple[Any, Any]:
+        """Follow the keys inside nested dicts.
+
+        Returns the last container reached and the key to use on it. If a value that
+        is not a dict is reached (e.g. np.ndarray), all remaining keys are returned
+        as one tuple key, so it can be indexed at once.
+        """
+        i, last = 0, len(keys) - 1
+        while i < last and isinstance(data, dict):
+            data = data[keys[i]]
+            i += 1
+        return data, (keys[i:] if i < last else keys[last])
+
     @editing
     def __setitem__(
         self, __key: Union[str, tuple], __value: "DICT_OR_LIST_LIKE"
@@ -584,24 +886,29 @@ class DH5:
                     "Key should be a string or tuple with at least two elements"
                 )
 
-            self.__add_key(__key[0])
             if self.__check_read_only_true(__key[0]):
                 raise ReadOnlyKeyError(__key[0], action="set")
-            return self.__getitem__(__key[0]).__setitem__(
-                __key[1:] if len(__key) > 2 else __key[1], __value  # type: ignore
+            container, last_key = self._walk(
+                self.__get_data_or_raise__(__key[0]), __key[1:]
             )
+            # Registered only once the key is known to exist and to be writable
+            self.__add_key(__key[0])
+            container[last_key] = __value
+            return None
 
-        if self.__check_read_only_true(__key):
+        read_only = self._read_only
+        if read_only and (read_only is True or __key in read_only):
             raise ReadOnlyKeyError(__key, action="set")
 
         self.__add_key(__key)
         __value = transform_to_possible_formats(__value)
 
         if self._read_only is not True:
-            if hasattr(__value, "save"):
+            has_save, has_init_filepath, has_post_init = _value_hooks(type(__value))
+            if has_save:
                 self._classes_should_be_saved_internally.add(__key)
 
-            if hasattr(__value, "__init__filepath__") and self._filepath:
+            if has_init_filepath and self._filepath:
                 key = (
                     __key if self._key_prefix is None else f"{self._key_prefix}/{__key}"
                 )
@@ -611,7 +918,7 @@ class DH5:
                     save_on_edit=self._save_on_edit,
                 )
 
-            if hasattr(__value, "__post__init__"):
+            if has_post_init:
                 __value.__post__init__()  # type: ignore
 
         self.__set_data__(__key, __value)
@@ -622,18 +929,18 @@ class DH5:
 
     def __getattr__(self, __name: str):
         """Call if __getattribute__ does not work."""
-        if (
-            len(__name) > 1
-            and __name[0] == "i"
-            and __name[1:].isdigit()
-            and __name not in self
-        ):
+        try:
+            keys = object.__getattribute__(self, "_keys")
+        except AttributeError:
+            # The object is not initialized yet
+            raise AttributeError(f"No attribute {__name} found in DH5") from None
+
+        if __name in keys:
+            return self.get(__name)
+        if len(__name) > 1 and __name[0] == "i" and __name[1:].isdigit():
             __name = __name[1:]
-        if __name in self:
-            data = self.get(__name)
-            # if isinstance(data, dict) and data:
-            #     return DH5(filepath=self._filepath, data=data, key_prefix=__name)
-            return data
+            if __name in keys:
+                return self.get(__name)
         raise AttributeError(f"No attribute {__name} found in DH5")
 
     def __setattr__(self, __name: str, __value: "DICT_OR_LIST_LIKE") -> None:
@@ -641,7 +948,7 @@ class DH5:
         if __name.startswith("_"):
             return object.__setattr__(self, __name, __value)
 
-        if isinstance(vars(self.__class__).get(__name), property):
+        if isinstance(getattr(type(self), __name, None), property):
             return object.__setattr__(self, __name, __value)
         return self.__setitem__(__name, __value)
 
@@ -660,38 +967,68 @@ class DH5:
 
     def __get_data__(self, __key: str, __default: Any = None):
         if __key in self._unopened_keys:
-            self._load_from_h5(key=__key)
+            self._load_unopened_key(__key)
         data = self._data.get(__key, __default)
-        if isinstance(data, NotLoaded):
+        if data is NOT_LOADED:
             self._load_from_h5(key=__key)
             data = self._data.get(__key, __default)
         if self.__check_read_only_true(__key):
-            if hasattr(data, "_read_only"):
-                data._read_only = True  # type: ignore # pylint: disable=protected-access
-            else:
-                data = deepcopy(data)
+            data = self.__protect(data)
         return data
 
+    def __protect(self, data):
+        """Return data that cannot modify the stored value of a read-only key.
+
+        Keys locked with `lock_data` are returned as read-only views (see `_freeze`).
+        In whole-file read-only mode a writable copy is returned instead, so that
+        the caller can still work with the values read from the file.
+        """
+        if hasattr(data, "_read_only"):
+            data._read_only = True  # type: ignore # pylint: disable=protected-access
+            return data
+        if self._read_only is True:
+            return fast_deepcopy(data)
+        return _freeze(data)
+
     def __get_data_or_raise__(self, __key):
         # self.pull(auto=True)
         if __key in self._unopened_keys:
-            self._load_from_h5(key=__key)
+            self._load_unopened_key(__key)
         data = self._data.__getitem__(__key)
-        if isinstance(data, NotLoaded):
+        if data is NOT_LOADED:
             self._load_from_h5(key=__key)
             data = self._data.__getitem__(__key)
         if self.__check_read_only_true(__key):
-            if hasattr(data, "_read_only"):
-                data._read_only = True  # type: ignore # pylint: disable=protected-access
-            else:
-                data = deepcopy(data)
+            data = self.__protect(data)
         return data
 
     def __set_data__(self, __key: str, __value):
         # self.pull(auto=True)
         return self._data.__setitem__(__key, __value)
 
-    def items(self):
+    def items(self) -> Iterator[Tuple[str, Any]]:
+        """Iterate over all items in the collection.
+
+        Items that were not opened yet are loaded one by one during the iteration,
+        so the whole file is never loaded at once. Use `items_eager` to load everything first.
+        """
+        yield from list(self._data.items())
+        if not self._unopened_keys:
+            return
+        # A single handle is used for the whole iteration. It's closed before any save
+        close_after = not (self._keep_file_open and self._read_only is True)
+        try:
+            for key in list(self._unopened_keys):
+                if key not in self._unopened_keys:
+                    continue  # loaded or removed during the iteration
+                self._load_from_h5(key={key}, keep_open=True)
+                if key in self._data:
+                    yield key, self._data[key]
+        finally:
+            if close_after:
+                self._close_handle()
+
+    def items_eager(self):
         """Return all items in the collection.
 
         It opens all items that were not opened yet and return dictionary iterator.
@@ -710,10 +1047,15 @@ class DH5:
             self._load_from_h5(key=self._unopened_keys)
         return self._data.values()
 
-    def keys(self) -> Set[str]:
-        """Return all keys in the collection."""
+    def keys(self) -> FrozenSet[str]:
+        """Return all keys in the collection.
+
+        The result is cached until the keys change, so it's returned as a frozenset.
+        """
         # self.pull(auto=True)
-        return self._keys.copy().union(self._unopened_keys.copy())
+        if self._keys_cache is None:
+            self._keys_cache = frozenset(self._keys)
+        return self._keys_cache
 
     def keys_tree(self) -> Dict[str, Optional[dict]]:
         """Return dict of the keys, where value always is a dict or None.
@@ -744,7 +1086,9 @@ class DH5:
                 else None
             )
             self._repr = output_dict_structure(
-                self._data, additional_info=additional_info
+                self._data,
+                additional_info=additional_info,
+                max_items=MAX_REPR_ITEMS,
             ) + (
                 f"\nUnloaded keys: {self._unopened_keys}" if self._unopened_keys else ""
             )
@@ -769,7 +1113,7 @@ class DH5:
         return self.__repr__()
 
     def __contains__(self, item):
-        return (item in self._data) or (item in self._unopened_keys)
+        return item in self._keys
 
     def __dir__(self) -> Iterable[str]:
         return list(self._keys) + self._default_attr
@@ -819,7 +1163,9 @@ class DH5:
         Raises:
             ValueError: If the file is opened in read-only mode, it cannot be saved.
                 The file should be reopened in write mode before saving.
+            Exception: The error raised by a previous failed background save, if any.
         """
+        self._raise_write_error()
         if self._read_only is True:
             raise ValueError(
                 "Cannot save opened in a read-only mode. Should reopen the file"
@@ -839,64 +1185,143 @@ class DH5:
         if len(self._last_update) == 0:
             self._last_data_saved = True
 
-        filepath = self._check_if_filepath_was_set(filepath, self._filepath)
+        if filepath is None and self._filepath_noext is not None:
+            filepath = self._filepath_noext
+        else:
+            filepath = self._check_if_filepath_was_set(filepath, self._filepath)
 
         if only_update is False:
-            if self._read_only is False:
-                data_to_save = self._data
+            data, read_only = self._data, self._read_only
+            if not read_only:  # False or no locked keys
+                data_to_save = data
             else:
                 data_to_save = {
                     key: value
-                    for key, value in self._data.items()
-                    if key not in self._read_only or key in last_update
+                    for key, value in data.items()
+                    if key not in read_only or key in last_update
                 }
-            data_to_save.update(
-                {
-                    key: None
-                    for key in last_update
-                    if (key not in self._data) and not self.__check_read_only_true(key)
-                }
-            )
+            # Removed keys are saved as None, so they are deleted from the file
+            removed_keys = [
+                key
+                for key in last_update
+                if key not in data and not (read_only and key in read_only)
+            ]
+            if removed_keys:
+                if data_to_save is data:
+                    data_to_save = data.copy()
+                for key in removed_keys:
+                    data_to_save[key] = None
 
-            self.__h5py_utils_save_dict_with_retry(filepath=filepath, data=data_to_save)
+            self.__save_dict(filepath=filepath, data=data_to_save)
+
+            return self
+
+        if (
+            not last_update
+            and self._file_fp is not None
+            and filepath == self._filepath_noext
+        ):
+            # Nothing changed since the file was last written or read
+            return self
 
+        data, saved_internally = self._data, self._classes_should_be_saved_internally
+        if not saved_internally:
+            self.__save_dict(
+                filepath=filepath, data={key: data.get(key) for key in last_update}
+            )
             return self
 
+        data_to_save = {}
         for key in last_update:
-            if key in self._classes_should_be_saved_internally:
-                obj = self._data[key]
-                if hasattr(obj, "save"):
-                    self._data[key].save(only_update=only_update)
-                else:
-                    self._classes_should_be_saved_internally.remove(key)
-
-        self.__h5py_utils_save_dict_with_retry(
-            filepath=filepath,
-            data={
-                key: self._data.get(key)
-                for key in last_update
-                if key not in self._classes_should_be_saved_internally
-            },
-        )
+            value = data.get(key)
+            if key in saved_internally:
+                if hasattr(value, "save"):
+                    value.save(only_update=only_update)
+                    continue
+                saved_internally.remove(key)
+            data_to_save[key] = value
+
+        self.__save_dict(filepath=filepath, data=data_to_save)
+
+        return self
+
+    def __save_dict(self, filepath: str, data: dict):
+        """Save data now or, if `background_save` is set, queue it for the writer thread."""
+        if not self._background_save:
+            return self.__h5py_utils_save_dict_with_retry(filepath=filepath, data=data)
+
+        if self._write_lock is None:
+            self._write_lock = threading.Lock()
+        with self._write_lock:
+            # Pending data for the same file is merged, so each key is written once
+            self._pending_writes.setdefault(filepath, {}).update(data)
+            if self._writer is None:
+                self._writer = threading.Thread(
+                    target=self.__writer_loop, name="dh5-writer"
+                )
+                self._writer.start()
+        return None
 
+    def __writer_loop(self):
+        """Save pending data until there is nothing left. Run in the writer thread."""
+        while True:
+            with self._write_lock:  # type: ignore
+                if not self._pending_writes:
+                    self._writer = None
+                    return
+                filepath, data = self._pending_writes.popitem()
+            try:
+                self.__h5py_utils_save_dict_with_retry(filepath=filepath, data=data)
+            except Exception as error:  # pylint: disable=W0718
+                logging.exception("Background save to %s.h5 failed", filepath)
+                self._write_error = error
+
+    def flush(self: _SELF) -> _SELF:
+        """Wait until all saves queued in background (see `background_save`) are written.
+
+        Raises:
+            Exception: The error raised by the last failed background save, if any.
+        """
+        writer = self._writer
+        while writer is not None:
+            writer.join()
+            writer = self._writer
+        self._raise_write_error()
         return self
 
+    def _raise_write_error(self):
+        """Raise (once) the error of a failed background save, if any."""
+        error, self._write_error = self._write_error, None
+        if error is not None:
+            raise error
+
     def __h5py_utils_save_dict_with_retry(self, filepath: str, data: dict):
+        # The file cannot be written while it's opened for reading (e.g. during `items`)
+        self._close_handle()
         # print("open", time.time(), self._raise_file_locked_error)
         for i in range(self._retry_on_file_locked_error):
             try:
                 # print("_raise_file_locked_error", self._raise_file_locked_error, list(data.keys()))
-                self._file_modified_time = h5py_utils.save_dict(
-                    filename=filepath + ".h5", data=data, key_prefix=self._key_prefix
+                h5py_utils.save_dict(
+                    filename=filepath + ".h5",
+                    data=data,
+                    key_prefix=self._key_prefix,
+                    use_compression=self._use_compression,
                 )
+                self._file_fp = self._file_fingerprint(filepath + ".h5")
                 return
             except h5py_utils.FileLockedError as error:
                 if self._raise_file_locked_error:
                     raise error
-                logging.info("File is locked. waiting 2s and %d more retrying.", i)
-                from ..utils import async_utils
-
-                async_utils.sleep(1)
+                # Exponential backoff with jitter, so that competing writers don't retry in lockstep
+                delay = min(_RETRY_MAX_DELAY, _RETRY_BASE_DELAY * 2**i)
+                delay += random.random() * _RETRY_BASE_DELAY
+                logging.info(
+                    "File is locked. Waiting %.2fs, %d retries left.",
+                    delay,
+                    self._retry_on_file_locked_error - i - 1,
+                )
+                time.sleep(delay)
 
         raise h5py_utils.FileLockedError(
             f"Even after {self._retry_on_file_locked_error} data was not saved"
@@ -923,13 +1348,22 @@ class DH5:
 
         If the filepath is None, returns None.
         """
-        return None if self._filepath is None else (self._filepath.rsplit(".h5", 1)[0])
+        return self._filepath_noext
 
     @filepath.setter
     def filepath(self, value: str):
         if not isinstance(value, str):
             value = str(value)
-        self._filepath = value if value.endswith(".h5") else value + ".h5"
+        self._set_filepath(self._normalize(value))
+
+    def _set_filepath(self, filepath: Optional[str]) -> None:
+        """Set `_filepath` and the values derived from it."""
+        self._filepath = filepath
+        if filepath is None:
+            self._filepath_noext = self._filename = None
+        else:
+            self._filepath_noext = filepath.rsplit(".h5", 1)[0]
+            self._filename = os.path.basename(self._filepath_noext)
 
     @property
     def filename(self) -> Optional[str]:
@@ -938,16 +1372,78 @@ class DH5:
         Returns:
             Optional[str]: The filename of the current filepath, or None if the filepath is None.
         """
-        filepath = self.filepath
-        if filepath is None:
-            return None
-        return os.path.basename(filepath)
+        return self._filename
 
     @property
     def save_on_edit(self):
         """Return the current value of the save_on_edit attribute."""
         return self._save_on_edit
 
+    @property
+    def use_compression(self) -> Optional[Union[Literal[True], str]]:
+        """Compression of the arrays written by `save`.
+
+        None (default) saves uncompressed, True or "gzip" uses gzip. Large gzip arrays
+        are compressed by chunk in several threads.
+        """
+        return self._use_compression
+
+    @use_compression.setter
+    def use_compression(self, value: Optional[Union[Literal[True], str]]):
+        self._use_compression = value
+
+    @property
+    def parallel_workers(self) -> int:
+        """Number of processes used to load many keys at once.
+
+        0 (default) loads in the current process. Used only when at least 16 keys
+        are loaded together, e.g. by `items_eager` or `load`.
+        """
+        return self._parallel_workers
+
+    @parallel_workers.setter
+    def parallel_workers(self, value: int):
+        self._parallel_workers = value
+
+    @property
+    def keep_file_open(self) -> bool:
+        """Keep the file opened between reads in read-only mode. Defaults to False.
+
+        It holds the HDF5 file lock, so no other process can write to the file until
+        `close` is called or this property is set back to False.
+        """
+        return self._keep_file_open
+
+    @keep_file_open.setter
+    def keep_file_open(self, value: bool):
+        self._keep_file_open = value
+        if not value:
+            self._close_handle()
+
+    @property
+    def pull_check_ttl(self) -> float:
+        """Time in seconds during which the result of `pull_available` is reused.
+
+        Defaults to 0.1. Put 0 to check the file on every call.
+        """
+        return self._pull_check_ttl
+
+    @pull_check_ttl.setter
+    def pull_check_ttl(self, value: float):
+        self._pull_check_ttl = value
+
+    @property
+    def background_save(self) -> bool:
+        """Write saves in a background thread. Defaults to False.
+
+        Call `flush` (or `close`, or use the object as a context manager) to wait for them.
+        """
+        return self._background_save
+
+    @background_save.setter
+    def background_save(self, value: bool):
+        self._background_save = value
+
     def asdict(self):
         """Return the internal data of the object as a dictionary.
 
@@ -959,16 +1455,50 @@ class DH5:
     def pull_available(self):
         """Check if the file has been modified elsewhere since the last save.
 
+        The modification time and the size of the file are compared first. If they did not
+        change, the hash of the beginning and the end of the file is compared to the one
+        computed at the previous check, so that a modification is detected even on
+        filesystems with coarse modification time. The hash is not computed on load or save.
+
+        The answer is reused for `pull_check_ttl` seconds (0.1 by default) unless the
+        file was saved or loaded by this object in the meantime, so polling this method
+        in a loop doesn't stat the file every time.
+
         Raises:
             ValueError: If the filepath has not been set.
 
         Returns:
             bool: True if the file has been modified, False otherwise.
         """
-        if self.filepath is None:
+        filepath = self._filepath
+        if filepath is None:
             raise ValueError("Cannot pull from file if it's not been set")
-        file_modified = os.path.getmtime(self.filepath + ".h5")
-        return self._file_modified_time != file_modified
+
+        now = time.monotonic()
+        file_fp = self._file_fp
+        cached = self._pull_check_cache
+        if (
+            cached is not None
+            and cached[0] is file_fp
+            and now - self._last_time_data_checked < self._pull_check_ttl
+        ):
+            return cached[1]
+
+        stat = os.stat(filepath)
+        if file_fp is None or file_fp[:2] != (stat.st_mtime_ns, stat.st_size):
+            available = True
+        else:
+            content_hash = h5py_utils.file_content_hash(filepath)
+            if file_fp[2] is None:
+                # First check with the same mtime and size: the hash becomes the reference
+                file_fp = self._file_fp = file_fp[:2] + (content_hash,)
+                available = False
+            else:
+                available = file_fp[2] != content_hash
+
+        self._last_time_data_checked = now
+        self._pull_check_cache = (file_fp, available)
+        return available
 
     def pull(self, force_pull: bool = False):
         """Pull data from a file and reloads it into the object.
@@ -988,8 +1518,11 @@ class DH5:
 
         if force_pull or self.pull_available():
             logging.debug("File modified so it will be reloaded.")
+            self._close_handle()
             self._data = {}
             self._keys = set()
+            self._unopened_keys = set()
+            self._keys_changed()
             self._clean_precalculated_results()
             self._load_from_h5()
 
@@ -1025,19 +1558,16 @@ class DH5:
             Self.
         """
         if every is True:
-            for k in self.keys():
-                self.close_data(k)
-            return self
+            keys = self._keys - self._unopened_keys
         elif key is None:
             raise ValueError("Should provide key or every=True.")
+        else:
+            keys = {key} if isinstance(key, str) else set(key)
 
-        if not isinstance(key, str):
-            for k in key:
-                self.close_data(k)
-            return self
-
-        if key not in self._unopened_keys:
-            self._data.pop(key)
-        self._unopened_keys.add(key)
+        data, unopened_keys = self._data, self._unopened_keys
+        for k in keys - unopened_keys:
+            data.pop(k)
+            unopened_keys.add(k)
+        self._keys_changed()
 
         return self
@@ -1,9 +1,22 @@
 # flake8: noqa: D100
 import inspect
 import logging
+from functools import lru_cache
 from typing import Any
 
 
+@lru_cache(maxsize=256)
+def _compile_func(code: str):
+    """Compile the code defining `current_func` and return this function.
+
+    Cached by the code, so the same function loaded from many files is compiled once.
+    """
+    namespace: dict = {}
+    cc = compile(code, "<string>", "exec")  # noqa: DUO110
+    exec(cc, namespace)  # pylint: disable=W0122 # noqa: DUO105
+    return namespace.get("current_func")
+
+
 class Function:
     """Function class contains code of a function that can be evaluated.
 
@@ -53,16 +66,12 @@ class Function:
             )
 
         try:
-            cc = compile(self.code, "<string>", "single")  # noqa: DUO110
-            eval(cc)  # pylint: disable=W0123 # noqa: DUO104
+            self.func = _compile_func(self.code)
         except SyntaxError:
             logging.warning(
                 "Function %s cannot be loaded because unexpected SyntaxError.",
                 self.original_name,
             )
-            return
-
-        self.func = locals().get("current_func")
 
     def eval(self, *args, **kwds):
         """Evaluate the function and return the result."""
@@ -1,6 +1,21 @@
 """Contains all custom JSON decoders used."""
 
 import json
+import re
+
+# Integer or decimal number. A group participates in the match only for a decimal one
+_NUMBER = re.compile(r"-?(?:\d+(\.\d*)?|(\.\d+))")
+
+
+def _decode_number(obj: str):
+    """Return int or float if the string is a number, otherwise the string itself."""
+    match = _NUMBER.fullmatch(obj)
+    if match is None:
+        return obj
+    try:
+        return int(obj) if match.lastindex is None else float(obj)
+    except ValueError:  # pragma: no cover
+        return obj  # pragma: no cover
 
 
 class NumbersDecoder(json.JSONDecoder):
@@ -12,19 +27,25 @@ class NumbersDecoder(json.JSONDecoder):
         return self._decode(result)
 
     def _decode(self, obj):
-        """Decode numbers if obj is one, or look inside if obj is a list or a dict."""
+        """Decode numbers if obj is one, or look inside if obj is a list or a dict.
+
+        Lists and dicts are modified in place.
+        """
         if isinstance(obj, str):
-            try:
-                obj_check = obj[1:] if obj.startswith("-") else obj
-                if obj_check.isnumeric():
-                    return int(obj)
-                if obj_check.count(".") == 1 and obj_check.replace(".", "").isnumeric():
-                    return float(obj)
-                return obj
-            except ValueError:  # pragma: no cover
-                return obj  # pragma: no cover
-        if isinstance(obj, dict):
-            return {k: self._decode(v) for k, v in obj.items()}
-        if isinstance(obj, list):
-            return [self._decode(v) for v in obj]
+            return _decode_number(obj)
+
+        stack = [obj]
+        while stack:
+            current = stack.pop()
+            if isinstance(current, dict):
+                items = current.items()
+            elif isinstance(current, list):
+                items = enumerate(current)
+            else:
+                continue
+            for key, value in items:
+                if isinstance(value, str):
+                    current[key] = _decode_number(value)
+                elif isinstance(value, (dict, list)):
+                    stack.append(value)
         return obj
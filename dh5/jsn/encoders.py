@@ -6,7 +6,11 @@ class StringEncoder(json.JSONEncoder):
     """Classical JSONEncoder will not try to convert objects to a str. This does."""
 
     def default(self, o):
-        """Additionally encode all iterators as a list."""
+        """Additionally encode all iterators as a list.
+
+        The elements of the list are encoded by the encoder itself, so numbers stay numbers
+        and `default` is called again only for the elements it cannot encode.
+        """
         if hasattr(o, "__iter__"):
-            return [self.default(obj) for obj in iter(o)]
+            return list(o)
         return str(o)
@@ -1,6 +1,7 @@
 # flake8: noqa: D100
 import os
 import pathlib
+from functools import cached_property
 from typing import Iterable, Optional, Union
 
 
@@ -13,6 +14,8 @@ class Path(type(pathlib.Path())):
     - make_extension
     - dirname
     - basename
+
+    `dirname`, `basename` and `str` are computed once per instance, as paths are immutable.
     """
 
     def __add__(self, other: Union["Path", str]):
@@ -53,19 +56,20 @@ class Path(type(pathlib.Path())):
         for ext in extension:
             if path.endswith(ext):
                 return self
-        return type(self)(self.as_posix() + extension[0])
+        return type(self)(path + extension[0])
 
-    @property
+    @cached_property
     def dirname(self) -> "Path":
         """Same as os.path.dirname."""
-        return type(self)(os.path.dirname(self))
+        # `parent` reuses the already parsed parts instead of reparsing a string
+        return self.parent
 
-    @property
+    @cached_property
     def basename(self) -> "Path":
         """Same as os.path.basename."""
-        return type(self)(os.path.basename(self))
+        return type(self)(self.name)
 
-    @property
+    @cached_property
     def str(self) -> str:
         return str(self)
 
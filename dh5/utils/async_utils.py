@@ -1,5 +1,5 @@
 """This module contains asynchronous functions."""
-import threading
+import time
 
 
 def sleep(delay):
@@ -9,6 +9,4 @@ def sleep(delay):
         delay (float): The delay in seconds.
 
     """
-    event = threading.Event()
-    event.wait(delay)
-    event.clear()
+    time.sleep(delay)
@@ -1,10 +1,16 @@
 """Random utilities for the dh5 package."""
 
+import re
+import time
 from typing import TYPE_CHECKING, Optional, Tuple, Union
 
 if TYPE_CHECKING:
     from pathlib import Path  # pragma: no cover
 
+_TIMESTAMP_FORMAT = "%Y_%m_%d__%H_%M_%S"
+# Timestamp prefix, main part starting with a letter and optional numerical suffix
+_TIMESTAMP_RE = re.compile(r"([_-]*\d[\d_-]*)_([A-Za-z].*?)(?:__(\d+))?", re.DOTALL)
+
 
 def get_timestamp() -> str:
     """Get the current timestamp in the format 'YYYY_MM_DD__HH_MM_SS'.
@@ -12,10 +18,7 @@ def get_timestamp() -> str:
     Returns:
         str: The current timestamp.
     """
-    import datetime
-
-    x = datetime.datetime.now()
-    return x.strftime("%Y_%m_%d__%H_%M_%S")
+    return time.strftime(_TIMESTAMP_FORMAT)
 
 
 def lstrip_int(line: str) -> Optional[Tuple[str, str, str]]:
@@ -29,25 +32,10 @@ def lstrip_int(line: str) -> Optional[Tuple[str, str, str]]:
         Optional[Tuple[str, str, str]]: A tuple containing the prefix, main part, and suffix
             of the line if a timestamp is found, None otherwise.
     """
-    import re
-
-    main = re.search("_[A-Za-z]", line)
-    if main is None:
+    match = _TIMESTAMP_RE.fullmatch(line)
+    if match is None:
         return None
-    prefix, main = line[: main.start()], line[main.start() + 1 :]
-    if "__" in main:
-        suffix_index = main.rfind("__")
-        suffix = main[suffix_index + 2 :]
-        if suffix.isdecimal():
-            main = main[:suffix_index]
-        else:
-            suffix = ""
-    else:
-        suffix = ""
-
-    if not prefix.replace("_", "").replace("-", "").isdigit():
-        return None
-
+    prefix, main, suffix = match.groups("")
     return prefix.strip("_"), main, suffix
 
 
@@ -41,7 +41,7 @@ setuptools.setup(
         "h5py",
     ],
     extras_require={
-        "all": [""],
+        "all": ["orjson", "xxhash"],
         "dev": [
             "matplotlib",
             "pytest",
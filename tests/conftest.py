@@ -0,0 +1,29 @@
+"""Pytest configuration shared by all the tests."""
+
+import os
+
+import pytest
+
+_DATA_PATH_NAMES = ("DATA_DIR", "DATA_FILE_PATH")
+
+
+@pytest.fixture(autouse=True, scope="module")
+def worker_data_dir(request):
+    """Give each pytest-xdist worker its own `DATA_DIR`, so that parallel runs do not share files.
+
+    Test modules keep their data in the module level `DATA_DIR` (and `DATA_FILE_PATH` inside
+    of it). With xdist these paths get the worker id as suffix, e.g. `tmp_test_data_gw0`.
+    """
+    worker = os.environ.get("PYTEST_XDIST_WORKER")
+    data_dir = getattr(request.module, "DATA_DIR", None)
+    if not worker or data_dir is None:
+        yield
+        return
+
+    worker_dir = f"{data_dir}_{worker}"
+    with pytest.MonkeyPatch.context() as patch:
+        for name in _DATA_PATH_NAMES:
+            path = getattr(request.module, name, None)
+            if isinstance(path, str) and path.startswith(data_dir):
+                patch.setattr(request.module, name, worker_dir + path[len(data_dir) :])
+        yield
@@ -0,0 +1,36 @@
+# flake8: noqa: D101, D102
+import unittest
+
+import numpy as np
+
+from dh5.dh5_class.fast_copy import fast_deepcopy
+
+
+class FastDeepcopyTest(unittest.TestCase):
+    def test_nested_containers(self):
+        data = {"a": [1, [2, 3]], "b": {"c": (4, [5])}, "d": "str"}
+        data_copy = fast_deepcopy(data)
+        self.assertEqual(data_copy, data)
+        self.assertIsNot(data_copy["a"][1], data["a"][1])
+        self.assertIsNot(data_copy["b"], data["b"])
+        self.assertIsNot(data_copy["b"]["c"][1], data["b"]["c"][1])
+
+    def test_array(self):
+        data = {"arr": np.arange(3)}
+        data_copy = fast_deepcopy(data)
+        data_copy["arr"][0] = 5
+        self.assertEqual(data["arr"][0], 0)
+
+    def test_other_objects(self):
+        class Test:
+            def __init__(self):
+                self.value = [1]
+
+        obj = Test()
+        obj_copy = fast_deepcopy(obj)
+        self.assertIsNot(obj_copy.value, obj.value)
+        self.assertEqual(obj_copy.value, obj.value)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -31,6 +31,13 @@ class FunctionClassTest(unittest.TestCase):
         result = func(1, 2)
         self.assertEqual(result, 3)
 
+    def test_same_code_compiled_once(self):
+        code = "def test_func(a, b): return a * b"
+        func1, func2 = Function(code), Function(code)
+        self.assertEqual(func1.eval(2, 3), 6)
+        self.assertEqual(func2.eval(2, 3), 6)
+        self.assertIs(func1.func, func2.func)
+
     def test_function_to_str(self):
         def sample_function():
             return "Hello, World!"
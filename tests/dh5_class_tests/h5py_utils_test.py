@@ -0,0 +1,66 @@
+# flake8: noqa: D101, D102
+import os
+import shutil
+import unittest
+from unittest import mock
+
+import h5py
+import numpy as np
+
+from dh5 import DH5
+from dh5.dh5_class import h5py_utils
+
+TEST_DIR = os.path.dirname(__file__)
+DATA_DIR = os.path.join(TEST_DIR, "tmp_test_data_h5py_utils")
+DATA_FILE_PATH = os.path.join(DATA_DIR, "some_data.h5")
+
+
+class DirectChunkWriteTest(unittest.TestCase):
+    def save_and_read(self, data):
+        with mock.patch.object(h5py_utils, "DIRECT_CHUNK_MIN_NBYTES", 1000), mock.patch.object(
+            h5py_utils, "DIRECT_CHUNK_NBYTES", 4000
+        ):
+            h5py_utils.save_dict(DATA_FILE_PATH, {"a": data}, use_compression=True)
+        with h5py.File(DATA_FILE_PATH, "r") as file:
+            self.assertEqual(file["a"].compression, "gzip")
+            return file["a"][()]
+
+    def test_2d_array(self):
+        data = np.random.rand(1001, 7)
+        np.testing.assert_array_equal(self.save_and_read(data), data)
+
+    def test_1d_int_array(self):
+        data = np.arange(12345, dtype=np.int16)
+        np.testing.assert_array_equal(self.save_and_read(data), data)
+
+    def test_wide_array_is_chunked_along_every_axis(self):
+        data = np.random.rand(2, 3001)
+        with mock.patch.object(h5py_utils, "DIRECT_CHUNK_MIN_NBYTES", 1000), mock.patch.object(
+            h5py_utils, "DIRECT_CHUNK_NBYTES", 4000
+        ):
+            h5py_utils.save_dict(DATA_FILE_PATH, {"a": data}, use_compression=True)
+        with h5py.File(DATA_FILE_PATH, "r") as file:
+            self.assertLessEqual(np.prod(file["a"].chunks) * 8, 4000)
+            np.testing.assert_array_equal(file["a"][()], data)
+
+    def test_dh5_save_uses_compression(self):
+        sd = DH5(DATA_FILE_PATH, overwrite=True)
+        sd.use_compression = True
+        data = np.random.rand(1001, 7)
+        with mock.patch.object(h5py_utils, "DIRECT_CHUNK_MIN_NBYTES", 1000), mock.patch.object(
+            h5py_utils, "DIRECT_CHUNK_NBYTES", 4000
+        ):
+            sd["a"] = data
+            sd.save()
+        with h5py.File(DATA_FILE_PATH, "r") as file:
+            self.assertEqual(file["a"].compression, "gzip")
+            np.testing.assert_array_equal(file["a"][()], data)
+
+    def test_small_array_is_not_chunked_directly(self):
+        with mock.patch.object(h5py_utils, "_create_dataset_direct_chunks") as direct:
+            h5py_utils.save_dict(DATA_FILE_PATH, {"a": np.arange(10)}, use_compression=True)
+            direct.assert_not_called()
+
+    def tearDown(self):
+        if os.path.exists(DATA_DIR):
+            shutil.rmtree(DATA_DIR)
@@ -9,11 +9,14 @@ everything is good.
 import os
 import shutil
 import unittest
+from unittest import mock
 
+import h5py
 import numpy as np
 
 from dh5 import DH5
 from dh5.dh5_class import h5py_utils
+from dh5.dh5_class.internal_classes import NOT_LOADED, NotLoaded
 
 TEST_DIR = os.path.dirname(__file__)
 DATA_DIR = os.path.join(TEST_DIR, "tmp_test_data")
@@ -119,6 +122,29 @@ class WithoutSavingTest(unittest.TestCase):
         self.assertIsInstance(self.data_smart.get_raw("dict"), dict)
         self.assertDictEqual(self.data_smart.get_raw("dict", {}), data)
 
+    def test_get_dict_is_cached(self):
+        self.data_smart["dict"] = {"a": 1, "b": 2}
+        sub = self.data_smart.get("dict")
+        self.assertIs(self.data_smart.get("dict"), sub)
+
+        self.data_smart["dict"] = {"a": 3}
+        sub2 = self.data_smart.get("dict")
+        self.assertIsNot(sub2, sub)
+        self.assertDictEqual(sub2.asdict(), {"a": 3})
+
+        self.assertDictEqual(self.data_smart.get("missing", {"c": 1}).asdict(), {"c": 1})
+
+    def test_get_dict_cached_after_inplace_edit(self):
+        self.data_smart["dict"] = {"a": 1}
+        sub = self.data_smart.get("dict")
+        repr(sub)
+        self.data_smart["dict"]["d"] = 4
+
+        sub = self.data_smart.get("dict")
+        self.assertIn("d", sub)
+        self.assertEqual(set(sub.keys()), {"a", "d"})
+        self.assertIn("d", repr(sub))
+
     def test_getitem(self):
         data = self.create_random_data()
         self.apply_func("update", data_to_get=data)
@@ -130,6 +156,11 @@ class WithoutSavingTest(unittest.TestCase):
 
         self.assertNpListEqual(self.data_smart["a3"], data)
 
+    def test_setitem_tuple_missing_key(self):
+        with self.assertRaises(KeyError):
+            self.data_smart["missing", "x"] = 1
+        self.assertNotIn("missing", self.data_smart)
+
     def test_setitem_tuple_dict(self):
         data = self.create_random_data()
         self.data_smart["a3"] = {}
@@ -138,6 +169,15 @@ class WithoutSavingTest(unittest.TestCase):
         self.assertNpListEqual(self.data_smart["a3"]["b"], data)
         self.assertNpListEqual(self.data_smart["a3", "b"], data)
 
+    def test_setitem_tuple_nested(self):
+        self.data_smart["a3"] = {"b": {"c": 1}, "arr": np.arange(6).reshape(2, 3)}
+        self.data_smart["a3", "b", "c"] = 2
+        self.data_smart["a3", "arr", slice(None), 0] = -1
+
+        self.assertEqual(self.data_smart["a3", "b", "c"], 2)
+        self.assertDictEqual(self.data_smart["a3"]["b"], {"c": 2})
+        self.assertNpListEqual(self.data_smart["a3", "arr", slice(None), 0], [-1, -1])
+
     def test_setitem_tuple_list(self):
         data = self.create_random_data()
         self.data_smart["a3"] = data.copy()
@@ -254,6 +294,13 @@ class WithoutSavingTest(unittest.TestCase):
 
         self.assertIn("Test", rep)
 
+    def test_repr_is_bounded(self):
+        sd = DH5({f"key{i}": i for i in range(100)})
+        rep = repr(sd)
+        self.assertIn("key63", rep)
+        self.assertNotIn("key64", rep)
+        self.assertIn("36 more keys", rep)
+
     def test_keys_tree(self):
         data = self.create_random_data()
         self.data_smart["ab1"] = data
@@ -547,6 +594,29 @@ class ReadModeTest(unittest.TestCase):
         d["dict", "b"] = 5
         self.assertDictEqual(d["dict"], {"a": 1, "b": 5})
 
+    def test_locked_array_is_not_writeable(self):
+        d = DH5(DATA_FILE_PATH, save_on_edit=True, overwrite=False)
+        d["arr"] = np.arange(3)
+        d["dict"] = {"arr": np.arange(3)}
+        d.lock_data(["arr", "dict"])
+
+        with self.assertRaises(ValueError):
+            d["arr"][0] = 5
+        with self.assertRaises(ValueError):
+            d["dict"]["arr"][0] = 5
+        self.assertEqual(d["arr"][0], 0)
+        self.assertEqual(d["dict"]["arr"][0], 0)
+
+    def test_read_only_file_array_is_writeable_copy(self):
+        d = DH5(DATA_FILE_PATH, save_on_edit=True, overwrite=False)
+        d["arr"] = np.arange(3)
+
+        d_read = DH5(DATA_FILE_PATH)
+        arr = d_read["arr"]
+        arr -= 1
+        self.assertEqual(arr[0], -1)
+        self.assertEqual(d_read["arr"][0], 0)
+
     @classmethod
     def tearDownClass(cls):
         """Remove tmp_test_data directory ones all test finished."""
@@ -831,6 +901,40 @@ class PullTest(unittest.TestCase):
         self.assertTrue("a" in sd2)
         self.assertEqual(sd2["a"], 1)
 
+    def test_pull_available_with_same_mtime(self):
+        sd1 = DH5(DATA_FILE_PATH, save_on_edit=True, overwrite=True)
+        sd1["a"] = np.arange(3)
+        sd1.pull_check_ttl = 0
+        self.assertFalse(sd1.pull_available())
+
+        stat = os.stat(DATA_FILE_PATH)
+        with h5py.File(DATA_FILE_PATH, "a") as file:
+            file["a"][0] = 5  # type: ignore
+        os.utime(DATA_FILE_PATH, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        self.assertTrue(sd1.pull_available())
+
+    def test_load_and_save_do_not_hash_the_file(self):
+        with mock.patch.object(h5py_utils, "file_content_hash") as content_hash:
+            sd1 = DH5(DATA_FILE_PATH, save_on_edit=True, overwrite=True)
+            sd1.update(a=1, b=2)
+            sd2 = DH5(DATA_FILE_PATH, open_on_init=False)
+            self.assertEqual(sd2["a"], 1)
+            self.assertEqual(sd2["b"], 2)
+            content_hash.assert_not_called()
+
+    def test_pull_available_is_cached(self):
+        sd1 = DH5(DATA_FILE_PATH, save_on_edit=True, overwrite=True)
+        sd1["a"] = 1
+        sd1.pull_check_ttl = 60
+        self.assertFalse(sd1.pull_available())
+
+        with mock.patch("os.stat") as stat:
+            self.assertFalse(sd1.pull_available())
+            stat.assert_not_called()
+
+        sd1["a"] = 2  # saving resets the cache
+        self.assertFalse(sd1.pull_available())
+
     def test_pull_with_local(self):
         # from labmate.utils.async_utils import sleep
         sd1 = DH5()
@@ -902,6 +1006,103 @@ class OpenOnInitTest(WithoutSavingTest):
         sd = DH5(DATA_FILE_PATH, open_on_init=False)
         self.assertTrue(np.all(sd.get("a") == data))
 
+    def test_prefetch(self):
+        self.data_smart.update(a=1, b=2, c=3)
+
+        sd = DH5(DATA_FILE_PATH, open_on_init=False)
+        sd.prefetch(["b", "c"])
+        self.assertEqual(sd["a"], 1)
+        self.assertSetEqual(sd._unopened_keys, set())  # pylint: disable=W0212
+        self.assertDictEqual(sd._data, {"a": 1, "b": 2, "c": 3})  # pylint: disable=W0212
+
+    def test_prefetch_n(self):
+        self.data_smart.update(a=1, b=2, c=3)
+
+        sd = DH5(DATA_FILE_PATH, open_on_init=False)
+        sd._prefetch_n = 1  # pylint: disable=W0212
+        self.assertEqual(sd["a"], 1)
+        self.assertEqual(len(sd._unopened_keys), 1)  # pylint: disable=W0212
+
+    def test_items_are_loaded_one_by_one(self):
+        data = {f"a{i}": self.create_random_data() for i in range(3)}
+        self.data_smart.update(data)
+
+        sd = DH5(DATA_FILE_PATH, open_on_init=False)
+        items = sd.items()
+        key, value = next(items)
+        self.assertNpListEqual(value, data[key])
+        self.assertEqual(len(sd._unopened_keys), 2)  # pylint: disable=W0212
+
+        self.assertEqual(len(list(items)), 2)
+        self.assertSetEqual(sd._unopened_keys, set())  # pylint: disable=W0212
+
+    def test_items_open_the_file_once(self):
+        data = {f"a{i}": self.create_random_data() for i in range(3)}
+        self.data_smart.update(data)
+
+        sd = DH5(DATA_FILE_PATH, open_on_init=False, mode="a")
+        with mock.patch.object(
+            h5py_utils, "open_read_handle", wraps=h5py_utils.open_read_handle
+        ) as open_read_handle:
+            for key, value in sd.items():
+                self.assertNpListEqual(value, data[key])
+            open_read_handle.assert_called_once()
+        self.assertIsNone(sd._h5_file)  # pylint: disable=W0212
+
+        sd.close_data(every=True)
+        for key, _ in sd.items():
+            sd[key + "_copy"] = 1
+            sd.save()
+        self.assertEqual(DH5(DATA_FILE_PATH)["a0_copy"], 1)
+
+    def test_keep_file_open(self):
+        self.data_smart.update(a=1, b=2)
+
+        sd = DH5(DATA_FILE_PATH, open_on_init=False)
+        sd.keep_file_open = True
+        self.assertEqual(sd["a"], 1)
+        file = sd._h5_file  # pylint: disable=W0212
+        self.assertTrue(file.id.valid)
+        self.assertEqual(sd["b"], 2)
+        self.assertIs(sd._h5_file, file)  # pylint: disable=W0212
+
+        sd.close()
+        self.assertFalse(file.id.valid)
+
+    def test_parallel_load(self):
+        data = {f"a{i}": self.create_random_data() for i in range(4)}
+        self.data_smart.update(data)
+
+        sd = DH5(DATA_FILE_PATH, open_on_init=False)
+        sd.parallel_workers = 2
+        self.assertNotIn("parallel_workers", sd)
+        with mock.patch.object(DH5, "_parallel_min_keys", 2):
+            for key, value in sd.items_eager():
+                self.assertNpListEqual(value, data[key])
+
+    def test_close_data(self):
+        self.data_smart.update(a=1, b=2, c=3)
+
+        sd = DH5(DATA_FILE_PATH)
+        sd.close_data("a")
+        self.assertSetEqual(sd._unopened_keys, {"a"})  # pylint: disable=W0212
+        sd.close_data(["a", "b"])
+        self.assertSetEqual(sd._unopened_keys, {"a", "b"})  # pylint: disable=W0212
+        sd.close_data(every=True)
+        self.assertDictEqual(sd._data, {})  # pylint: disable=W0212
+
+        self.assertEqual(sd["b"], 2)
+        self.assertSetEqual(set(sd.keys()), {"a", "b", "c"})
+
+    def test_pop_not_loaded(self):
+        self.data_smart["a"] = self.create_random_data()
+
+        sd = DH5(DATA_FILE_PATH, "a", open_on_init=False)
+        self.assertIs(sd.pop("a"), NOT_LOADED)
+        self.assertIs(NotLoaded(), NOT_LOADED)
+        self.assertNotIn("a", sd)
+        self.assertNotIn("a", sd.keys())
+
     @classmethod
     def tearDownClass(cls):
         """Remove tmp_test_data directory ones all test finished."""
@@ -929,6 +1130,116 @@ class RandomCasesTest(unittest.TestCase):
             with h5py_utils.LockFile(DATA_FILE_PATH):
                 sd1["a"] = 2
 
+    def test_class_level_configuration(self):
+        class RetryOnce(DH5):
+            _retry_on_file_locked_error = 1
+
+        sd1 = RetryOnce(DATA_FILE_PATH, save_on_edit=True, overwrite=True)
+        self.assertEqual(sd1._retry_on_file_locked_error, 1)  # pylint: disable=W0212
+
+        with mock.patch.object(DH5, "_raise_file_locked_error", True):
+            sd2 = DH5(DATA_FILE_PATH, save_on_edit=True, overwrite=True)
+            self.assertTrue(sd2._raise_file_locked_error)  # pylint: disable=W0212
+
+    def test_empty_update_does_not_save(self):
+        sd1 = DH5(DATA_FILE_PATH, save_on_edit=True, overwrite=True)
+        sd1["b"] = 3
+
+        with mock.patch.object(DH5, "save") as save:
+            sd1.update({})
+            save.assert_not_called()
+            sd1.update({"b": 4})
+            save.assert_called_once()
+
+    def test_full_save_after_delete(self):
+        sd1 = DH5(DATA_FILE_PATH, overwrite=True, read_only=False)
+        sd1.update(a=1, b=2)
+        sd1.save()
+        del sd1["a"]
+        sd1.save(only_update=False)
+
+        self.assertNotIn("a", sd1._data)  # pylint: disable=W0212
+        self.assertNotIn("a", DH5(DATA_FILE_PATH))
+
+    def test_save_without_changes_does_not_write(self):
+        sd1 = DH5(DATA_FILE_PATH, overwrite=True, read_only=False)
+        sd1.save()
+        self.assertTrue(os.path.exists(DATA_FILE_PATH))
+
+        sd1["a"] = 1
+        sd1.save()
+        with mock.patch.object(h5py_utils, "save_dict") as save_dict:
+            sd1.save()
+            save_dict.assert_not_called()
+
+    def test_background_save(self):
+        sd1 = DH5(DATA_FILE_PATH, save_on_edit=True, overwrite=True)
+        sd1.background_save = True
+        for i in range(5):
+            sd1["a"] = i
+        sd1["b"] = 2
+        sd1.flush()
+
+        sd2 = DH5(DATA_FILE_PATH)
+        self.assertEqual(sd2["a"], 4)
+        self.assertEqual(sd2["b"], 2)
+
+    def test_background_save_context_manager(self):
+        with DH5(DATA_FILE_PATH, save_on_edit=True, overwrite=True) as sd1:
+            sd1.background_save = True
+            self.assertNotIn("background_save", sd1)
+            sd1["a"] = 1
+        self.assertIsNone(sd1._writer)  # pylint: disable=W0212
+        self.assertEqual(DH5(DATA_FILE_PATH)["a"], 1)
+
+    def test_background_save_error(self):
+        sd1 = DH5(DATA_FILE_PATH, save_on_edit=True, overwrite=True)
+        sd1.background_save = True
+        with mock.patch.object(h5py_utils, "save_dict", side_effect=OSError("disk full")):
+            sd1["a"] = 1
+            with self.assertRaises(OSError):
+                sd1.flush()
+        sd1.flush()
+
+    def test_background_save_error_raised_on_next_save_and_close(self):
+        def wait_writer(sd):
+            writer = sd._writer  # pylint: disable=W0212
+            while writer is not None:
+                writer.join()
+                writer = sd._writer  # pylint: disable=W0212
+
+        sd1 = DH5(DATA_FILE_PATH, overwrite=True)
+        sd1.background_save = True
+        with mock.patch.object(h5py_utils, "save_dict", side_effect=OSError("disk full")):
+            with self.assertLogs(level="ERROR"):
+                sd1["a"] = 1
+                sd1.save()
+                wait_writer(sd1)
+        with self.assertRaises(OSError):
+            sd1.save()
+        sd1.save()
+
+        with mock.patch.object(h5py_utils, "save_dict", side_effect=OSError("disk full")):
+            with self.assertLogs(level="ERROR"):
+                sd1["a"] = 2
+                sd1.save()
+                wait_writer(sd1)
+        with self.assertRaises(OSError):
+            sd1.close()
+
+    def test_save_without_changes_to_other_file(self):
+        sd1 = DH5(DATA_FILE_PATH, save_on_edit=True, overwrite=True)
+        sd1["a"] = 1
+        other_path = os.path.join(DATA_DIR, "other_data.h5")
+        self.addCleanup(lambda: os.path.exists(other_path) and os.remove(other_path))
+
+        sd1.save(filepath=other_path)
+        self.assertTrue(os.path.exists(other_path))
+
+    def test_getattr_on_uninitialized_object(self):
+        sd = DH5.__new__(DH5)
+        self.assertFalse(hasattr(sd, "a"))
+
     def test_filename_without_extension(self):
         sd1 = DH5(DATA_FILE_PATH[:-3], save_on_edit=True, overwrite=True)
         sd1["b"] = 3
@@ -940,6 +1251,7 @@ class RandomCasesTest(unittest.TestCase):
         sd1["b"] = 3
 
         sd1.filepath = DATA_FILE_PATH[:-3] + "2"
+        self.assertEqual(sd1.filename, os.path.basename(DATA_FILE_PATH[:-3]) + "2")
         sd1.save(force=True)
 
         sd1["c"] = 4
@@ -38,6 +38,10 @@ class JsonTest(unittest.TestCase):
         data_to_write = {"d": {"key3": 3.123, "key1": -123.213, "key2": 2}}
         self.write_read_assert(data_to_write)
 
+    def test_nested(self):
+        data_to_write = {"d": {"l": [1, [2.5, {"a": -3}], "abc"]}, "key1": 1}
+        self.write_read_assert(data_to_write)
+
     def test_stringable(self):
         # Test writing to and reading from a file
         class Stringable:
@@ -9,6 +9,8 @@ DATA_DIR = os.path.join(TEST_DIR, "tmp_test_data")
 
 
 class TestPath(unittest.TestCase):
+    _dirty = False
+
     def test_addition(self):
         # Test the addition of two paths
         path1 = Path("/path/to")
@@ -25,18 +27,22 @@ class TestPath(unittest.TestCase):
         # Test the makedirs functionality
         # You might need to use a temporary directory for this
         path = Path(DATA_DIR) / "test_folder"
+        type(self)._dirty = True
         path.makedirs()
         self.assertTrue(os.path.exists(path.absolute().str))
 
     def test_make_extension(self):
         # Test the make_extension functionality
-        path = Path("some_file")
-        self.assertEqual(path.make_extension(".txt").str, "some_file.txt")
-
-    def test_make_list_extension(self):
-        # Test the make_extension functionality
-        path = Path("some_file")
-        self.assertEqual(path.make_extension([".txt", ".pdf"]).str, "some_file.txt")
+        cases = [
+            ("some_file", ".txt", "some_file.txt"),
+            ("some_file", [".txt", ".pdf"], "some_file.txt"),
+            ("some_file.pdf", ".txt", "some_file.pdf.txt"),
+            ("some_file.txt", ".txt", "some_file.txt"),
+            ("some_file.txt", [".txt", ".pdf"], "some_file.txt"),
+        ]
+        for base, extension, expected in cases:
+            with self.subTest(base=base, extension=extension):
+                self.assertEqual(Path(base).make_extension(extension).str, expected)
 
     def test_make_extension_error(self):
         # Test the make_extension functionality
@@ -44,21 +50,6 @@ class TestPath(unittest.TestCase):
         with self.assertRaises(ValueError):
             path.make_extension(1)
 
-    def test_make_second_extension(self):
-        # Test the make_extension functionality
-        path = Path("some_file.pdf")
-        self.assertEqual(path.make_extension(".txt").str, "some_file.pdf.txt")
-
-    def test_make_existed_extension(self):
-        # Test the make_extension functionality
-        path = Path("some_file.txt")
-        self.assertEqual(path.make_extension(".txt").str, "some_file.txt")
-
-    def test_make_list_existed_extension(self):
-        # Test the make_extension functionality
-        path = Path("some_file.txt")
-        self.assertEqual(path.make_extension([".txt", ".pdf"]).str, "some_file.txt")
-
     def test_dirname(self):
         # Test the dirname property
         path = Path("/path/to/file.txt")
@@ -69,11 +60,18 @@ class TestPath(unittest.TestCase):
         path = Path("/path/to/file.txt")
         self.assertEqual(path.basename.str, "file.txt")
 
+    def test_properties_cached(self):
+        # Test that dirname, basename and str are computed only once
+        path = Path("/path/to/file.txt")
+        self.assertIs(path.dirname, path.dirname)
+        self.assertIs(path.basename, path.basename)
+        self.assertIs(path.str, path.str)
+
     @classmethod
     def tearDownClass(cls):
         """Remove tmp_test_data directory ones all test finished."""
         # data_directory = os.path.join(os.path.dirname(__file__), DATA_DIR)
-        if os.path.exists(DATA_DIR):
+        if cls._dirty and os.path.exists(DATA_DIR):
             shutil.rmtree(DATA_DIR)
         return super().tearDownClass()
 
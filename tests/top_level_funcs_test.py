@@ -1,6 +1,7 @@
 # flake8: noqa: D101, D102
 import os
 import shutil
+import tempfile
 import unittest
 
 import dh5
@@ -9,6 +10,8 @@ from dh5.errors import ReadOnlyKeyError
 TEST_DIR = os.path.dirname(__file__)
 DATA_DIR = os.path.join(TEST_DIR, "tmp_test_data")
 DATA_FILE_PATH = os.path.join(DATA_DIR, "some_data.h5")
+# tmpfs keeps the per-test files off the block device when it is available.
+TMP_ROOT = "/dev/shm" if os.path.isdir("/dev/shm") else None
 
 
 class LoadTest(unittest.TestCase):
@@ -16,9 +19,14 @@ class LoadTest(unittest.TestCase):
 
     data = {"a": 1, "b": 2}
 
-    def setUp(self):
+    @classmethod
+    def create_file(cls):
+        dh5.DH5(data=cls.data).save(filepath=DATA_FILE_PATH)
+
+    @classmethod
+    def setUpClass(cls):
         os.makedirs(DATA_DIR, exist_ok=True)
-        dh5.DH5(data=self.data).save(filepath=DATA_FILE_PATH)
+        cls.create_file()
 
     def test_load_read(self):
         file = dh5.load(filepath=DATA_FILE_PATH, mode="r")
@@ -29,6 +37,7 @@ class LoadTest(unittest.TestCase):
             file["c"] = 3
 
     def test_load_write(self):
+        self.addCleanup(self.create_file)
         file = dh5.load(filepath=DATA_FILE_PATH, mode="w", overwrite=True)
         for key in self.data.keys():
             self.assertFalse(key in file)
@@ -40,6 +49,7 @@ class LoadTest(unittest.TestCase):
         self.assertEqual(file2["c"], 3)
 
     def test_load_append(self):
+        self.addCleanup(self.create_file)
         file = dh5.load(filepath=DATA_FILE_PATH, mode="a")
         for key, value in self.data.items():
             self.assertEqual(file[key], value)
@@ -63,59 +73,65 @@ class SaveTest(unittest.TestCase):
     data2 = {"c": 3, "d": 4}
 
     def setUp(self):
-        os.makedirs(DATA_DIR, exist_ok=True)
+        self._tmp = tempfile.TemporaryDirectory(dir=TMP_ROOT)
+        self.file_path = os.path.join(self._tmp.name, "some_data.h5")
 
     def test_save_new(self):
-        file = dh5.save(self.data, DATA_FILE_PATH)
+        file = dh5.save(self.data, self.file_path)
         for key, value in self.data.items():
             self.assertEqual(file[key], value)
 
-        file2 = dh5.load(filepath=DATA_FILE_PATH, mode="r")
+        file2 = dh5.load(filepath=self.file_path, mode="r")
         for key, value in self.data.items():
             self.assertEqual(file2[key], value)
 
     def test_save_overwrite_unset(self):
-        dh5.save(self.data, DATA_FILE_PATH)
+        dh5.save(self.data, self.file_path)
 
         with self.assertRaises(FileExistsError):
-            dh5.save(self.data, DATA_FILE_PATH)
+            dh5.save(self.data, self.file_path)
 
     def test_save_overwrite_false(self):
-        dh5.save(self.data, DATA_FILE_PATH)
-        file = dh5.save(self.data2, DATA_FILE_PATH, overwrite=False).load()
+        dh5.save(self.data, self.file_path)
+        file = dh5.save(self.data2, self.file_path, overwrite=False).load()
 
         for key, value in {**self.data, **self.data2}.items():
             self.assertEqual(file[key], value)
 
-        file2 = dh5.load(filepath=DATA_FILE_PATH, mode="r")
+        file2 = dh5.load(filepath=self.file_path, mode="r")
         for key, value in {**self.data, **self.data2}.items():
             self.assertEqual(file2[key], value)
 
     def test_save_overwrite_true(self):
-        dh5.save(self.data, DATA_FILE_PATH, overwrite=True)
-        file = dh5.save(self.data2, DATA_FILE_PATH, overwrite=True).load()
+        dh5.save(self.data, self.file_path, overwrite=True)
+        file = dh5.save(self.data2, self.file_path, overwrite=True).load()
         for key, value in self.data2.items():
             self.assertEqual(file[key], value)
         for key in self.data.keys():
             self.assertFalse(key in file, msg=f"key: {key} in file: {file}")
 
-        file2 = dh5.load(filepath=DATA_FILE_PATH, mode="r")
+        file2 = dh5.load(filepath=self.file_path, mode="r")
         for key, value in self.data2.items():
             self.assertEqual(file2[key], value)
         for key in self.data:
             self.assertFalse(key in file2)
 
     def test_save_append(self):
-        dh5.save(self.data, DATA_FILE_PATH)
-        file = dh5.save(self.data2, DATA_FILE_PATH, mode="a").load()
+        dh5.save(self.data, self.file_path)
+        file = dh5.save(self.data2, self.file_path, mode="a").load()
         for key, value in {**self.data, **self.data2}.items():
             self.assertEqual(file[key], value)
 
-        file2 = dh5.load(filepath=DATA_FILE_PATH, mode="r")
+        file2 = dh5.load(filepath=self.file_path, mode="r")
         for key, value in {**self.data, **self.data2}.items():
             self.assertEqual(file2[key], value)
 
+    def test_save_does_not_modify_input(self):
+        data = {"a": {"b": 1}}
+        file = dh5.save(data, self.file_path)
+        file["a"]["b"] = 2
+        file["c"] = 3
+        self.assertDictEqual(data, {"a": {"b": 1}})
+
     def tearDown(self):
-        if os.path.exists(DATA_FILE_PATH):
-            os.remove(DATA_FILE_PATH)
-        # shutil.rmtree(DATA_DIR)
+        self._tmp.cleanup()